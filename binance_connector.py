@@ -1,22 +1,165 @@
 # dual_grid_bot/binance_connector.py
 
 import asyncio
+import aiohttp
+import concurrent.futures
 import ccxt
 import logging
 import math
+import random
 import time
 import json
 import websockets
 import hmac
 import hashlib
+import requests
+import numpy as np
 from decimal import Decimal
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Callable, Collection, Dict, List, Optional, Any, Sequence, Tuple
 
-from data_models import TradingRule, OrderCandidate, TradeType, OrderType, PositionAction
+try:
+    import orjson
+except ImportError:  # orjson未安装时回退到标准库json
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # msgspec未安装时bookTicker走通用JSON解析
+    msgspec = None
+
+try:
+    from numba import njit
+except ImportError:  # numba未安装时批量量化使用纯NumPy实现
+    njit = None
+
+from data_models import TradingRule, OrderCandidate, OrderEvent, TradeType, OrderType, PositionAction, to_decimal
 
 # WebSocket配置
 WEBSOCKET_URL = "wss://fstream.binance.com/ws"
 SYNC_TIME = 10  # 同步时间（秒）
+WATCHDOG_INTERVAL = 5  # 心跳看门狗检查间隔（秒）
+HEARTBEAT_TIMEOUT = 60  # 超过该时间无消息认为连接异常（秒）
+USER_STREAM_TIMEOUT = 30  # 用户数据流无消息超时（秒）
+RECONNECT_BACKOFF_BASE = 1.0  # 重连退避的最小等待（秒）
+RECONNECT_BACKOFF_CAP = 30.0  # 重连退避的最大等待（秒）
+RATE_LIMIT_RETRIES = 3  # 遇到429/418限频时的重试次数
+RATE_LIMIT_BACKOFF_BASE = 0.5  # 限频重试的初始等待（秒），每次翻倍
+
+def _to_ticks(value, increment: Decimal, increment_float: float) -> int:
+    """将价格/数量换算为最小变动单位的整数倍（向下取整）"""
+    if isinstance(value, float):
+        # 浮点输入直接按整数tick计算，避免Decimal(str(float))的转换开销
+        return math.floor(value / increment_float + 1e-9)
+    return int(value // increment)
+
+
+def _quantize_array(values: np.ndarray, increment: float) -> np.ndarray:
+    """批量将价格/数量按最小变动单位向下取整"""
+    return np.floor(values / increment + 1e-9) * increment
+
+
+if njit is not None:
+    _quantize_array = njit(fastmath=True, cache=True)(_quantize_array)
+
+
+_D0 = Decimal("0")
+
+# 整数精度位数 -> 最小变动单位（如 3 -> 0.001）
+_PRECISION_TO_DECIMAL = {i: Decimal(10) ** -i for i in range(13)}
+
+
+# REST连接池配置（复用TCP/TLS连接，避免每次请求重新握手）
+HTTP_POOL_SIZE = 20
+HTTP_KEEPALIVE_TIMEOUT = 75  # 空闲连接保持时间（秒）
+HTTP_DNS_CACHE_TTL = 300  # aiohttp的DNS缓存时间（秒）
+REST_TIMEOUT_MS = 5000  # ccxt REST请求超时（毫秒）
+REST_KEEPALIVE_INTERVAL = 30  # REST空闲超过该时间（秒）时ping一次，防止连接被服务端关闭
+
+# 批量撤单接口单次最多撤销的订单数
+BATCH_CANCEL_LIMIT = 10
+
+# 每个账户独立的REST线程池大小（账户之间的阻塞调用互不排队）
+REST_EXECUTOR_WORKERS = 4
+
+# 异步余额查询的缓存时间（秒），短时间内的重复检查复用结果
+BALANCE_CACHE_TTL = 2.0
+
+# listenKey请求超时（秒），原生异步请求，不占用线程池
+LISTEN_KEY_TIMEOUT = 10
+
+# 账户清理后的验证重试（次数、间隔秒数）
+CLEANUP_VERIFY_RETRIES = 3
+CLEANUP_VERIFY_DELAY = 1
+
+# 挂单统计的REST对账间隔（秒），平时由WebSocket订单事件增量维护
+ORDER_RECONCILE_INTERVAL = 60
+
+# (订单方向, 持仓方向) -> 挂单统计字段
+_ORDER_BUCKETS = {
+    ('BUY', 'LONG'): 'buy_long_orders',
+    ('SELL', 'LONG'): 'sell_long_orders',
+    ('BUY', 'SHORT'): 'buy_short_orders',
+    ('SELL', 'SHORT'): 'sell_short_orders',
+}
+
+# 订单结束状态（从挂单统计中移除）
+_ORDER_DONE_STATUSES = ('FILLED', 'CANCELED', 'EXPIRED', 'EXPIRED_IN_MATCH')
+
+# JSON编解码（优先使用orjson，WebSocket热路径上解析更快）
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _json_dumps(payload: Dict[str, Any]) -> str:
+        return orjson.dumps(payload).decode()
+else:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+# bookTicker消息的类型化解码器（只解码用到的字段，属性访问代替dict查找）
+if msgspec is not None:
+    class BookTickerMsg(msgspec.Struct):
+        e: str
+        b: str
+        a: str
+
+    _book_ticker_decoder = msgspec.json.Decoder(BookTickerMsg)
+else:
+    _book_ticker_decoder = None
+
+# bookTicker消息以 {"e":"bookTicker" 开头，检查前缀即可识别
+_BOOK_TICKER_PEEK = 20
+
+# 用户数据流中需要处理的事件类型，其余事件（如TRADE_LITE）不做JSON解析
+_USER_EVENT_TYPES = frozenset(('ORDER_TRADE_UPDATE', 'ACCOUNT_UPDATE', 'listenKeyExpired'))
+
+
+def _peek_event_type(message) -> Optional[str]:
+    """从原始消息中直接切出事件类型字段"e"，无需解析整个JSON"""
+    if isinstance(message, bytes):
+        message = message.decode()
+    start = message.find('"e":"')
+    if start < 0:
+        return None
+    start += 5
+    end = message.find('"', start)
+    return message[start:end] if end >= 0 else None
+
+
+def _parse_book_ticker(message: str) -> Optional[Tuple[str, str]]:
+    """按固定字段直接切出bookTicker的买一/卖一价格，不经过JSON解析"""
+    bid_start = message.find('"b":"')
+    ask_start = message.find('"a":"')
+    if bid_start < 0 or ask_start < 0:
+        return None
+
+    bid_start += 5
+    ask_start += 5
+    bid_end = message.find('"', bid_start)
+    ask_end = message.find('"', ask_start)
+    if bid_end < 0 or ask_end < 0:
+        return None
+
+    return message[bid_start:bid_end], message[ask_start:ask_end]
 
 
 class CustomBinance(ccxt.binance):
@@ -63,9 +206,20 @@ class BinanceConnector:
         # 初始化交易所连接
         self.exchange = self._initialize_exchange(sandbox)
 
+        # 交易对的市场信息、市场ID（如 DOGEUSDC）和WebSocket流名称，只在初始化时解析一次
+        self._market = self.exchange.market(self.trading_pair)
+        self._market_id = self._market['id']
+        self._stream_symbol = self._market_id.lower()
+
         # 获取交易规则
         self.trading_rules = self._get_trading_rules()
 
+        # 量化用的最小变动单位（预先缓存，价格和数量在内部按整数tick处理）
+        self._price_increment = self.trading_rules.min_price_increment
+        self._amount_increment = self.trading_rules.min_base_amount_increment
+        self._price_increment_float = float(self._price_increment)
+        self._amount_increment_float = float(self._amount_increment)
+
         # 价格和持仓数据
         self.latest_price = Decimal("0")
         self.best_bid_price = Decimal("0")
@@ -74,12 +228,14 @@ class BinanceConnector:
         # 持仓数据
         self.long_position = Decimal("0")
         self.short_position = Decimal("0")
+        self.position_version = 0  # 持仓每次更新（REST或ACCOUNT_UPDATE）后递增
 
         # 挂单数据
         self.buy_long_orders = Decimal("0")
         self.sell_long_orders = Decimal("0")
         self.sell_short_orders = Decimal("0")
         self.buy_short_orders = Decimal("0")
+        self._order_ticks_by_id: Dict[str, Tuple[str, int]] = {}  # 订单ID -> (统计字段, 数量tick数)
 
         # 时间戳
         self.last_position_update_time = 0
@@ -90,11 +246,22 @@ class BinanceConnector:
         self.event_queue = event_queue
 
         # WebSocket相关
-        self.listenKey = None
         self.user_data_stream_task: Optional['asyncio.Task'] = None
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        self._rest_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=REST_EXECUTOR_WORKERS,
+            thread_name_prefix=f"ccxt-{account_name or trading_pair}"
+        )
+        self._balance_cache: Dict[str, Tuple[float, Dict[str, Decimal]]] = {}  # 资产 -> (查询时间, 余额)
+        self._last_rest_time = 0.0  # 最近一次REST请求的时间（monotonic）
+        self.rest_keepalive_task: Optional['asyncio.Task'] = None
+        self._event_seq = 0
+        self._order_update_listeners: List[Callable[[], None]] = []
+        self.user_stream_last_message_time = 0
         self._listen_key: Optional[str] = None
         self._listen_key_last_update = 0
         self.websocket_task = None
+        self.listen_key_task: Optional['asyncio.Task'] = None
         self.websocket_running = False
         self.lock = asyncio.Lock()
 
@@ -105,11 +272,12 @@ class BinanceConnector:
         self.max_reconnect_delay = 60  # 最大重连延迟（秒）
         self.connection_healthy = True
         self.last_heartbeat_time = 0
+        self._connected = False  # 行情连接状态，由连接建立/断开及心跳看门狗维护
 
         # 跳过双向持仓模式设置（用户已在账户后台设置）
         # self._check_and_enable_hedge_mode()
 
-        # listenKey将在start_event_listening时获取
+        # listenKey将在建立WebSocket连接或start_event_listening时获取
         
     def _initialize_exchange(self, sandbox: bool = False) -> CustomBinance:
         """初始化交易所API连接 - 参考grid_binance.py的简化方法"""
@@ -120,8 +288,24 @@ class BinanceConnector:
                 "defaultType": "future",  # 使用永续合约
             },
             "sandbox": sandbox,
+            "timeout": REST_TIMEOUT_MS,
         })
 
+        # 使用带连接池的会话并显式保持长连接
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=0
+        )
+        session.mount("https://", adapter)
+        exchange.session = session
+        exchange.headers = {
+            **(exchange.headers or {}),
+            "Connection": "keep-alive",
+            "Keep-Alive": f"timeout={HTTP_KEEPALIVE_TIMEOUT}, max=1000",
+        }
+
         # 参考代码的方法：直接加载市场数据，但不做复杂处理
         exchange.load_markets(reload=False)
         self.logger.info("交易所连接已建立")
@@ -131,30 +315,30 @@ class BinanceConnector:
     def _get_trading_rules(self) -> TradingRule:
         """获取交易对的交易规则"""
         try:
-            markets = self.exchange.fetch_markets()
-            symbol_info = next(market for market in markets if market["symbol"] == self.trading_pair)
+            # 复用初始化时load_markets已加载的市场信息，无需再次请求
+            symbol_info = self._market
             
             # 获取价格精度
             price_precision = symbol_info["precision"]["price"]
             if isinstance(price_precision, float):
-                price_increment = Decimal(str(price_precision))
+                price_increment = to_decimal(price_precision)
             elif isinstance(price_precision, int):
-                price_increment = Decimal("0.1") ** price_precision
+                price_increment = _PRECISION_TO_DECIMAL[price_precision]
             else:
                 raise ValueError(f"Unknown price precision type: {price_precision}")
             
             # 获取数量精度
             amount_precision = symbol_info["precision"]["amount"]
             if isinstance(amount_precision, float):
-                amount_increment = Decimal(str(amount_precision))
+                amount_increment = to_decimal(amount_precision)
             elif isinstance(amount_precision, int):
-                amount_increment = Decimal("0.1") ** amount_precision
+                amount_increment = _PRECISION_TO_DECIMAL[amount_precision]
             else:
                 raise ValueError(f"Unknown amount precision type: {amount_precision}")
             
             # 获取最小下单数量和最小名义价值
-            min_order_size = Decimal(str(symbol_info["limits"]["amount"]["min"]))
-            min_notional_size = Decimal(str(symbol_info["limits"]["cost"]["min"]))
+            min_order_size = to_decimal(symbol_info["limits"]["amount"]["min"])
+            min_notional_size = to_decimal(symbol_info["limits"]["cost"]["min"])
             
             trading_rule = TradingRule(
                 trading_pair=self.trading_pair,
@@ -187,7 +371,7 @@ class BinanceConnector:
         """获取中间价格"""
         # 如果WebSocket连接健康且有最新价格，直接返回（快速路径）
         if self.is_connected() and self.latest_price > 0:
-            return Decimal(str(self.latest_price))
+            return to_decimal(self.latest_price)
 
         # 否则通过REST API获取（慢速路径）
         max_retries = 2  # 减少重试次数
@@ -201,11 +385,11 @@ class BinanceConnector:
                 last = None
 
                 if ticker.get('bid') is not None:
-                    bid = Decimal(str(ticker['bid']))
+                    bid = to_decimal(ticker['bid'])
                 if ticker.get('ask') is not None:
-                    ask = Decimal(str(ticker['ask']))
+                    ask = to_decimal(ticker['ask'])
                 if ticker.get('last') is not None:
-                    last = Decimal(str(ticker['last']))
+                    last = to_decimal(ticker['last'])
 
                 # 优先使用买卖价计算中间价
                 if bid and ask and bid > 0 and ask > 0:
@@ -227,7 +411,7 @@ class BinanceConnector:
                     else:
                         # 如果有历史价格，返回历史价格
                         if self.latest_price > 0:
-                            return Decimal(str(self.latest_price))
+                            return to_decimal(self.latest_price)
                         else:
                             raise ValueError("无法获取有效的价格数据")
 
@@ -238,7 +422,7 @@ class BinanceConnector:
                 else:
                     # 最后一次尝试失败，返回历史价格或抛出异常
                     if self.latest_price > 0:
-                        return Decimal(str(self.latest_price))
+                        return to_decimal(self.latest_price)
                     else:
                         raise ValueError(f"获取中间价格失败: {e}")
 
@@ -256,9 +440,9 @@ class BinanceConnector:
             # 获取指定资产的余额信息
             if asset in balance:
                 return {
-                    "free": Decimal(str(balance[asset]["free"])),
-                    "used": Decimal(str(balance[asset]["used"])),
-                    "total": Decimal(str(balance[asset]["total"]))
+                    "free": to_decimal(balance[asset]["free"]),
+                    "used": to_decimal(balance[asset]["used"]),
+                    "total": to_decimal(balance[asset]["total"])
                 }
             else:
                 return {
@@ -274,25 +458,24 @@ class BinanceConnector:
     def get_positions(self) -> Tuple[Decimal, Decimal]:
         """获取当前持仓 (多头持仓, 空头持仓)"""
         try:
-            params = {'type': 'future'}
-            positions = self.exchange.fetch_positions(params=params)
+            # 只查询当前交易对的持仓（双向持仓模式下最多两条），避免解析整个账户的持仓
+            positions = self.exchange.fapiPrivateV2GetPositionRisk({'symbol': self._market_id})
             
             long_position = Decimal("0")
             short_position = Decimal("0")
             
             for position in positions:
-                if position['symbol'] == self.trading_pair:
-                    contracts = Decimal(str(position.get('contracts', 0)))
-                    side = position.get('side', None)
-                    
-                    if side == 'long':
-                        long_position = contracts
-                    elif side == 'short':
-                        short_position = abs(contracts)
+                position_amt = Decimal(position.get('positionAmt', '0'))
+                
+                if position_amt > 0:
+                    long_position = position_amt
+                elif position_amt < 0:
+                    short_position = abs(position_amt)
             
             # 更新内部状态
             self.long_position = long_position
             self.short_position = short_position
+            self.position_version += 1
             self.last_position_update_time = time.time()
             
             return long_position, short_position
@@ -304,8 +487,9 @@ class BinanceConnector:
     def get_open_orders(self) -> List[Dict[str, Any]]:
         """获取当前所有挂单"""
         try:
-            orders = self.exchange.fetch_open_orders(self.trading_pair)
-            return orders
+            # 直接调用接口并使用缓存的市场信息解析，跳过ccxt统一层的交易对解析
+            response = self.exchange.fapiPrivateGetOpenOrders({'symbol': self._market_id})
+            return self.exchange.parse_orders(response, self._market)
         except Exception as e:
             self.logger.error(f"获取挂单失败: {e}")
             return []
@@ -320,15 +504,31 @@ class BinanceConnector:
             return None
 
     def get_multiple_order_status(self, order_ids: List[str]) -> Dict[str, Dict[str, Any]]:
-        """批量获取多个订单状态"""
-        results = {}
+        """批量获取多个订单状态（一次allOrders查询，未覆盖的订单再逐个查询）"""
+        if not order_ids:
+            return {}
+
+        results = self._fetch_orders_since(order_ids)
         for order_id in order_ids:
-            try:
-                order = self.exchange.fetch_order(order_id, self.trading_pair)
-                results[order_id] = order
-            except Exception as e:
-                self.logger.error(f"获取订单状态失败 {order_id}: {e}")
-                results[order_id] = None
+            if order_id not in results:
+                results[order_id] = self.get_order_status(order_id)
+        return results
+
+    def _fetch_orders_since(self, order_ids: Collection[str]) -> Dict[str, Dict[str, Any]]:
+        """用一次allOrders查询获取订单状态，返回其中覆盖到的订单"""
+        results = {}
+        try:
+            # allOrders返回orderId不小于起始ID的订单，从最小ID开始即可一次覆盖
+            start_id = min(int(order_id) for order_id in order_ids)
+            orders = self.exchange.fetch_orders(
+                self.trading_pair, limit=1000, params={'orderId': start_id}
+            )
+            wanted = set(order_ids)
+            for order in orders:
+                if order['id'] in wanted:
+                    results[order['id']] = order
+        except Exception as e:
+            self.logger.error(f"批量获取订单状态失败，改为逐个查询: {e}")
         return results
 
     def get_recent_trades(self, limit: int = 50) -> List[Dict[str, Any]]:
@@ -340,49 +540,34 @@ class BinanceConnector:
             self.logger.error(f"获取成交记录失败: {e}")
             return []
 
-    def _get_listen_key(self):
-        """获取listenKey"""
-        try:
-            response = self.exchange.fapiPrivatePostListenKey()
-            self.listenKey = response.get("listenKey")
-            if not self.listenKey:
-                raise ValueError("获取的listenKey为空")
-            self.logger.info(f"成功获取listenKey: {self.listenKey[:10]}...")
-        except Exception as e:
-            self.logger.error(f"获取listenKey失败: {e}")
-            self.listenKey = None
-
-    async def _keep_listen_key_alive(self):
-        """定期更新listenKey"""
-        while self.websocket_running:
-            try:
-                await asyncio.sleep(1800)  # 每30分钟更新一次
-                if self.websocket_running:
-                    self.exchange.fapiPrivatePutListenKey()
-                    self._get_listen_key()
-                    self.logger.info("listenKey已更新")
-            except Exception as e:
-                self.logger.error(f"更新listenKey失败: {e}")
-                await asyncio.sleep(60)
-
     async def start_websocket(self):
-        """启动WebSocket连接"""
+        """启动WebSocket连接（已安装uvloop时运行在uvloop事件循环上）"""
         if self.websocket_running:
             return
 
         self.websocket_running = True
 
         # 启动listenKey保活任务
-        asyncio.create_task(self._keep_listen_key_alive())
+        self._ensure_listen_key_keepalive()
 
         # 启动WebSocket连接任务
         self.websocket_task = asyncio.create_task(self._websocket_loop())
 
+        # 启动REST连接保活任务
+        self.rest_keepalive_task = asyncio.create_task(self._rest_keepalive_loop())
+
         self.logger.info("WebSocket连接已启动")
 
     async def stop_websocket(self):
         """停止WebSocket连接"""
         self.websocket_running = False
+        self._connected = False
+
+        if self.listen_key_task:
+            self.listen_key_task.cancel()
+
+        if self.rest_keepalive_task:
+            self.rest_keepalive_task.cancel()
 
         if self.websocket_task:
             self.websocket_task.cancel()
@@ -391,28 +576,23 @@ class BinanceConnector:
             except asyncio.CancelledError:
                 pass
 
-        self.logger.info("WebSocket连接已停止")
-
-    def is_connected(self) -> bool:
-        """检查WebSocket连接健康状态"""
-        if not self.websocket_running:
-            return False
+        if self._http_session and not self._http_session.closed:
+            await self._http_session.close()
 
-        # 检查连接健康标志
-        if not self.connection_healthy:
-            return False
+        self.logger.info("WebSocket连接已停止")
 
-        # 检查心跳时间（如果超过90秒无心跳，认为连接不健康）
-        current_time = time.time()
-        if self.last_heartbeat_time > 0 and current_time - self.last_heartbeat_time > 90:
-            self.logger.warning("WebSocket连接心跳超时，连接可能不健康")
-            return False
+    async def close(self):
+        """关闭连接器：停止WebSocket并释放REST线程池（之后不能再发起REST请求）"""
+        await self.stop_websocket()
+        self._rest_executor.shutdown(wait=False, cancel_futures=True)
 
-        return True
+    def is_connected(self) -> bool:
+        """检查WebSocket连接健康状态（只读缓存的连接标志，心跳超时由看门狗负责置位）"""
+        return self._connected
 
     def get_connection_status(self) -> Dict[str, Any]:
         """获取连接状态详情"""
-        current_time = time.time()
+        current_time = time.monotonic()
         return {
             "websocket_running": self.websocket_running,
             "connection_healthy": self.connection_healthy,
@@ -454,174 +634,193 @@ class BinanceConnector:
 
     async def _connect_websocket(self):
         """连接WebSocket并订阅数据"""
-        if not self.listenKey:
-            self.logger.error("listenKey为空，无法连接WebSocket")
-            return
+        # 启用事件驱动时订单数据由用户数据流接收，行情连接只订阅ticker，避免同一事件处理两次
+        if self.event_queue is None and not self._listen_key:
+            await self._get_listen_key()
+
+        if self.event_queue is None and not self._listen_key:
+            # 抛出异常交给重连逻辑处理退避，避免空转
+            raise ConnectionError("listenKey为空，无法连接WebSocket")
 
         try:
             async with websockets.connect(
                 WEBSOCKET_URL,
                 ping_interval=20,  # 每20秒发送ping
                 ping_timeout=10,   # ping超时时间
-                close_timeout=10   # 关闭超时时间
+                close_timeout=10,  # 关闭超时时间
+                compression=None   # 禁用permessage-deflate，省去每帧解压开销
             ) as websocket:
                 self.logger.info("WebSocket连接已建立，开始订阅数据...")
 
-                # 订阅ticker数据
-                await self._subscribe_ticker(websocket)
-
-                # 订阅订单数据
-                await self._subscribe_orders(websocket)
+                # 订阅ticker和订单数据（单个SUBSCRIBE请求）
+                await self._subscribe_streams(websocket)
 
                 # 更新心跳时间
-                self.last_heartbeat_time = time.time()
+                self.last_heartbeat_time = time.monotonic()
+                self._connected = True
+
+                # 启动心跳看门狗（替代每条消息的wait_for超时计时器）
+                watchdog_task = asyncio.create_task(self._heartbeat_watchdog(websocket))
 
                 # 处理消息
-                while self.websocket_running:
-                    try:
-                        message = await asyncio.wait_for(websocket.recv(), timeout=30)
+                try:
+                    while self.websocket_running:
+                        message = await websocket.recv()
                         await self._handle_websocket_message(message)
 
                         # 更新心跳时间
-                        self.last_heartbeat_time = time.time()
-
-                    except asyncio.TimeoutError:
-                        # 检查连接健康状态
-                        current_time = time.time()
-                        if current_time - self.last_heartbeat_time > 60:  # 60秒无消息认为连接异常
-                            self.logger.warning("WebSocket连接超时，准备重连")
-                            raise ConnectionError("WebSocket连接超时")
-
-                        # 发送ping保持连接
-                        try:
-                            await websocket.ping()
-                            self.logger.debug("发送WebSocket ping")
-                        except Exception as ping_error:
-                            self.logger.error(f"发送ping失败: {ping_error}")
-                            raise
+                        self.last_heartbeat_time = time.monotonic()
 
-                    except Exception as e:
-                        self.logger.error(f"WebSocket消息处理失败: {e}")
-                        raise
+                except Exception as e:
+                    self.logger.error(f"WebSocket消息处理失败: {e}")
+                    raise
+                finally:
+                    self._connected = False
+                    watchdog_task.cancel()
 
         except Exception as e:
             self.logger.error(f"WebSocket连接异常: {e}")
             raise
 
-    async def _subscribe_ticker(self, websocket):
-        """订阅ticker数据"""
-        symbol = self.trading_pair.replace('/', '').replace(':USDC', 'USDC').lower()
-        payload = {
-            "method": "SUBSCRIBE",
-            "params": [f"{symbol}@bookTicker"],
-            "id": 1
-        }
-        await websocket.send(json.dumps(payload))
-        self.logger.info(f"已订阅ticker数据: {symbol}")
-
-    async def _subscribe_orders(self, websocket):
-        """订阅订单数据"""
-        if not self.listenKey:
-            self.logger.error("listenKey为空，无法订阅订单更新")
-            return
+    async def _heartbeat_watchdog(self, websocket, time_attr: str = 'last_heartbeat_time',
+                                  timeout: float = HEARTBEAT_TIMEOUT):
+        """定期检查消息心跳，长时间无消息时关闭连接以触发重连"""
+        try:
+            while True:
+                await asyncio.sleep(WATCHDOG_INTERVAL)
+                if time.monotonic() - getattr(self, time_attr) > timeout:
+                    self.logger.warning("WebSocket连接超时，准备重连")
+                    await websocket.close()
+                    return
+        except asyncio.CancelledError:
+            pass
 
+    async def _subscribe_streams(self, websocket):
+        """在一个SUBSCRIBE请求中订阅ticker，未启用用户数据流时同时订阅订单数据"""
+        params = [f"{self._stream_symbol}@bookTicker"]
+        if self.event_queue is None:
+            params.append(self._listen_key)
         payload = {
             "method": "SUBSCRIBE",
-            "params": [self.listenKey],
-            "id": 2
+            "params": params,
+            "id": 1
         }
-        await websocket.send(json.dumps(payload))
-        self.logger.info("已订阅订单数据")
+        await websocket.send(_json_dumps(payload))
+        self.logger.info(f"已订阅{'ticker' if self.event_queue is not None else 'ticker和订单数据'}: {self._stream_symbol}")
 
     async def _handle_websocket_message(self, message):
         """处理WebSocket消息"""
         try:
-            data = json.loads(message)
+            # 快速路径：bookTicker消息直接按字段切出价格，跳过JSON解析
+            if isinstance(message, str) and '"bookTicker"' in message[:_BOOK_TICKER_PEEK]:
+                prices = _parse_book_ticker(message)
+                if prices is not None:
+                    await self._handle_ticker_update(*prices)
+                    return
 
-            if data.get("e") == "bookTicker":
-                await self._handle_ticker_update(data)
-            elif data.get("e") == "ORDER_TRADE_UPDATE":
-                await self._handle_order_update(data)
+                # 切分失败时按bookTicker结构解码（只用于bookTicker消息，其它消息直接走通用解析）
+                if _book_ticker_decoder is not None:
+                    try:
+                        ticker = _book_ticker_decoder.decode(message)
+                    except msgspec.ValidationError:
+                        ticker = None
 
-        except Exception as e:
-            self.logger.error(f"处理WebSocket消息失败: {e}")
+                    if ticker is not None and ticker.e == "bookTicker":
+                        await self._handle_ticker_update(ticker.b, ticker.a)
+                        return
 
-    async def _handle_ticker_update(self, data):
-        """处理ticker更新"""
-        current_time = time.time()
-        if current_time - self.last_ticker_update_time < 0.1:  # 限制更新频率到100ms
-            return
+            data = _json_loads(message)
+            event_type = data.get("e")
 
-        self.last_ticker_update_time = current_time
+            if event_type == "bookTicker":
+                await self._handle_ticker_update(data.get("b"), data.get("a"))
+            elif event_type == "ORDER_TRADE_UPDATE":
+                await self._handle_order_update(data.get("o", {}))
 
+        except Exception as e:
+            self.logger.error(f"处理WebSocket消息失败: {e}")
+
+    async def _handle_ticker_update(self, best_bid_str: str, best_ask_str: str):
+        """处理ticker更新（每条消息都更新价格，不做节流）"""
         try:
-            best_bid = float(data.get("b", 0))
-            best_ask = float(data.get("a", 0))
+            best_bid = float(best_bid_str)
+            best_ask = float(best_ask_str)
 
             if best_bid > 0 and best_ask > 0:
-                self.latest_price = (best_bid + best_ask) / 2
-                # self.logger.debug(f"价格更新: {self.latest_price:.5f}")
+                self.latest_price = (best_bid + best_ask) * 0.5
+                self.last_ticker_update_time = time.monotonic()
 
         except (ValueError, TypeError) as e:
             self.logger.error(f"解析ticker数据失败: {e}")
 
-    async def _handle_order_update(self, data):
-        """处理订单更新"""
-        async with self.lock:
-            try:
-                order = data.get("o", {})
-                symbol = order.get("s")
-
-                # 检查是否是我们关注的交易对
-                expected_symbol = self.trading_pair.replace('/', '').replace(':USDC', 'USDC')
-                if symbol != expected_symbol:
-                    return
-
-                order_id = order.get("i")
-                status = order.get("X")  # 订单状态
-
-                self.logger.info(f"订单更新: {order_id}, 状态: {status}")
+    def _track_order_quantity(self, order_data: Dict[str, Any]):
+        """根据订单事件增量维护挂单统计"""
+        if order_data.get('s') != self._market_id:
+            return
 
-                # 这里可以添加更详细的订单状态处理逻辑
-                # 例如更新内部的订单跟踪状态
+        order_id = str(order_data.get('i'))
+        status = order_data.get('X')
+
+        if status == 'NEW':
+            bucket = _ORDER_BUCKETS.get((order_data.get('S'), order_data.get('ps')))
+            if bucket is None or order_id in self._order_ticks_by_id:
+                return
+            ticks = _to_ticks(float(order_data.get('q', 0)), self._amount_increment,
+                              self._amount_increment_float)
+            self._order_ticks_by_id[order_id] = (bucket, ticks)
+            setattr(self, bucket, getattr(self, bucket) + ticks * self._amount_increment)
+
+        elif status in _ORDER_DONE_STATUSES:
+            entry = self._order_ticks_by_id.pop(order_id, None)
+            if entry is not None:
+                bucket, ticks = entry
+                setattr(self, bucket, getattr(self, bucket) - ticks * self._amount_increment)
+
+    def update_order_status(self, force: bool = False):
+        """
+        更新挂单状态统计
 
-            except Exception as e:
-                self.logger.error(f"处理订单更新失败: {e}")
+        WebSocket连接正常时挂单统计由订单事件增量维护，这里只做低频REST对账，
+        force=True时立即对账。
+        """
+        if (not force and self.is_connected() and
+                time.monotonic() - self.last_orders_update_time < ORDER_RECONCILE_INTERVAL):
+            return
 
-    def update_order_status(self):
-        """更新挂单状态统计"""
         try:
             orders = self.get_open_orders()
 
-            # 重置计数器
-            buy_long_orders = Decimal("0")
-            sell_long_orders = Decimal("0")
-            buy_short_orders = Decimal("0")
-            sell_short_orders = Decimal("0")
+            # 重置计数器（按整数tick累加，循环结束后再转换为Decimal）
+            totals = dict.fromkeys(_ORDER_BUCKETS.values(), 0)
+            order_ticks_by_id = {}
 
             for order in orders:
-                orig_quantity = Decimal(str(abs(float(order.get('info', {}).get('origQty', 0)))))
+                info = order.get('info', {})
                 side = order.get('side')
-                position_side = order.get('info', {}).get('positionSide')
+                bucket = _ORDER_BUCKETS.get((side.upper() if side else None, info.get('positionSide')))
+                if bucket is None:
+                    continue
 
-                if side == 'buy' and position_side == 'LONG':
-                    buy_long_orders += orig_quantity
-                elif side == 'sell' and position_side == 'LONG':
-                    sell_long_orders += orig_quantity
-                elif side == 'buy' and position_side == 'SHORT':
-                    buy_short_orders += orig_quantity
-                elif side == 'sell' and position_side == 'SHORT':
-                    sell_short_orders += orig_quantity
+                ticks = _to_ticks(abs(float(info.get('origQty', 0))), self._amount_increment,
+                                  self._amount_increment_float)
+                totals[bucket] += ticks
+                order_ticks_by_id[str(order['id'])] = (bucket, ticks)
 
-            # 更新内部状态
+            buy_long_orders = totals['buy_long_orders'] * self._amount_increment
+            sell_long_orders = totals['sell_long_orders'] * self._amount_increment
+            buy_short_orders = totals['buy_short_orders'] * self._amount_increment
+            sell_short_orders = totals['sell_short_orders'] * self._amount_increment
+
+            # 更新内部状态（以REST结果校正增量统计的偏差）
+            self._order_ticks_by_id = order_ticks_by_id
             self.buy_long_orders = buy_long_orders
             self.sell_long_orders = sell_long_orders
             self.buy_short_orders = buy_short_orders
             self.sell_short_orders = sell_short_orders
-            self.last_orders_update_time = time.time()
+            self.last_orders_update_time = time.monotonic()
 
-            self.logger.debug(f"订单状态已更新: 多头买单={buy_long_orders}, 多头卖单={sell_long_orders}, "
-                            f"空头买单={buy_short_orders}, 空头卖单={sell_short_orders}")
+            self.logger.debug("订单状态已更新: 多头买单=%s, 多头卖单=%s, 空头买单=%s, 空头卖单=%s",
+                              buy_long_orders, sell_long_orders, buy_short_orders, sell_short_orders)
 
         except Exception as e:
             self.logger.error(f"更新订单状态失败: {e}")
@@ -693,15 +892,45 @@ class BinanceConnector:
     def cancel_order(self, order_id: str) -> bool:
         """撤销订单"""
         try:
-            self.exchange.cancel_order(order_id, self.trading_pair)
+            self.exchange.fapiPrivateDeleteOrder({'symbol': self._market_id, 'orderId': order_id})
             self.logger.info(f"订单已取消: {order_id}")
             return True
         except Exception as e:
             self.logger.error(f"取消订单 {order_id} 失败: {e}")
             return False
 
+    def cancel_orders_batch(self, order_ids: Sequence[str]) -> List[str]:
+        """批量撤销指定订单（单次最多BATCH_CANCEL_LIMIT个），返回撤销成功的订单ID"""
+        try:
+            response = self.exchange.fapiPrivateDeleteBatchOrders({
+                'symbol': self._market_id,
+                'orderIdList': _json_dumps([int(order_id) for order_id in order_ids])
+            })
+        except Exception as e:
+            self.logger.error(f"批量撤单失败 {list(order_ids)}: {e}")
+            return []
+
+        cancelled = []
+        for result in response:
+            if 'orderId' in result:
+                cancelled.append(str(result['orderId']))
+            else:
+                self.logger.error(f"批量撤单部分失败: {result}")
+
+        self.logger.info(f"批量撤单完成: {len(cancelled)}/{len(order_ids)}")
+        return cancelled
+
     def cancel_all_orders(self) -> bool:
-        """撤销所有挂单"""
+        """撤销所有挂单（优先使用批量撤单接口，一次请求撤销全部）"""
+        try:
+            response = self.exchange.fapiPrivateDeleteAllOpenOrders({
+                'symbol': self._market_id
+            })
+            self.logger.info(f"已批量取消所有挂单: {response}")
+            return True
+        except Exception as e:
+            self.logger.warning(f"批量撤单失败，改为逐个撤单: {e}")
+
         try:
             orders = self.get_open_orders()
             success_count = 0
@@ -717,33 +946,39 @@ class BinanceConnector:
             self.logger.error(f"取消所有订单失败: {e}")
             return False
 
+    def _close_position_candidates(self, long_pos: Decimal, short_pos: Decimal) -> List[OrderCandidate]:
+        """生成平掉多空持仓的市价单"""
+        candidates = []
+
+        # 平多头持仓
+        if long_pos > 0:
+            candidates.append(OrderCandidate(
+                trading_pair=self.trading_pair,
+                order_type=OrderType.MARKET,
+                order_side=TradeType.SELL,
+                amount=long_pos,
+                position_action=PositionAction.CLOSE
+            ))
+
+        # 平空头持仓
+        if short_pos > 0:
+            candidates.append(OrderCandidate(
+                trading_pair=self.trading_pair,
+                order_type=OrderType.MARKET,
+                order_side=TradeType.BUY,
+                amount=short_pos,
+                position_action=PositionAction.CLOSE
+            ))
+
+        return candidates
+
     def close_all_positions(self) -> bool:
         """市价平掉所有持仓"""
         try:
             long_pos, short_pos = self.get_positions()
             success = True
 
-            # 平多头持仓
-            if long_pos > 0:
-                order_candidate = OrderCandidate(
-                    trading_pair=self.trading_pair,
-                    order_type=OrderType.MARKET,
-                    order_side=TradeType.SELL,
-                    amount=long_pos,
-                    position_action=PositionAction.CLOSE
-                )
-                if not self.place_order(order_candidate):
-                    success = False
-
-            # 平空头持仓
-            if short_pos > 0:
-                order_candidate = OrderCandidate(
-                    trading_pair=self.trading_pair,
-                    order_type=OrderType.MARKET,
-                    order_side=TradeType.BUY,
-                    amount=short_pos,
-                    position_action=PositionAction.CLOSE
-                )
+            for order_candidate in self._close_position_candidates(long_pos, short_pos):
                 if not self.place_order(order_candidate):
                     success = False
 
@@ -754,25 +989,24 @@ class BinanceConnector:
             self.logger.error(f"平掉所有持仓失败: {e}")
             return False
 
-    def cleanup(self) -> bool:
+    async def cleanup(self) -> bool:
         """清理账户：撤销所有挂单并平掉所有持仓"""
         try:
             self.logger.info("开始清理账户...")
 
-            # 先撤销所有挂单
-            cancel_success = self.cancel_all_orders()
-
-            # 等待一下确保撤单完成
-            time.sleep(2)
-
-            # 再平掉所有持仓
-            close_success = self.close_all_positions()
+            # 先撤销所有挂单（批量撤单接口返回时服务端已完成撤单，无需等待）
+            cancel_success = await self.cancel_all_orders_async()
 
-            # 等待一下确保平仓完成
-            time.sleep(2)
+            # 再平掉所有持仓（多空两侧并发下单）
+            close_success = await self.close_all_positions_async()
 
-            # 验证清理结果
-            verification_success = self.verify_cleanup()
+            # 验证清理结果，成交回报稍有延迟时短暂重试
+            verification_success = await self.verify_cleanup_async()
+            for _ in range(CLEANUP_VERIFY_RETRIES):
+                if verification_success:
+                    break
+                await asyncio.sleep(CLEANUP_VERIFY_DELAY)
+                verification_success = await self.verify_cleanup_async()
 
             success = cancel_success and close_success and verification_success
             self.logger.info(f"账户清理完成: 成功={success}")
@@ -816,25 +1050,162 @@ class BinanceConnector:
             self.logger.error(f"资金划转失败: {e}")
             return False
 
-    def _quantize_price(self, price: Decimal) -> Decimal:
-        """量化价格到交易所要求的精度"""
-        if price.is_nan():
+    def _quantize_price(self, price) -> Decimal:
+        """量化价格到交易所要求的精度（支持Decimal或float输入）"""
+        if isinstance(price, Decimal) and price.is_nan():
             return price
 
-        increment = self.trading_rules.min_price_increment
-        return (price // increment) * increment
+        ticks = _to_ticks(price, self._price_increment, self._price_increment_float)
+        return ticks * self._price_increment
+
+    def _quantize_amount(self, amount) -> Decimal:
+        """量化数量到交易所要求的精度（支持Decimal或float输入）"""
+        ticks = _to_ticks(amount, self._amount_increment, self._amount_increment_float)
+        return ticks * self._amount_increment
+
+    def quantize_prices_batch(self, prices: Sequence[float]) -> np.ndarray:
+        """批量量化价格（float64数组），用于一次性处理多个网格层级"""
+        return _quantize_array(np.asarray(prices, dtype=np.float64), self._price_increment_float)
 
-    def _quantize_amount(self, amount: Decimal) -> Decimal:
-        """量化数量到交易所要求的精度"""
-        increment = self.trading_rules.min_base_amount_increment
-        return (amount // increment) * increment
+    def quantize_amounts_batch(self, amounts: Sequence[float]) -> np.ndarray:
+        """批量量化数量（float64数组）"""
+        return _quantize_array(np.asarray(amounts, dtype=np.float64), self._amount_increment_float)
 
     def get_trading_rules(self) -> TradingRule:
         """获取交易规则"""
         return self.trading_rules
 
-    def is_connected(self) -> bool:
-        """检查连接状态"""
+    # ==================== 异步REST接口 ====================
+    # ccxt同步调用会阻塞事件循环（同时运行着WebSocket），
+    # 以下方法将REST请求放到线程池中执行，供协程直接await
+
+    async def _run_rest(self, func, *args):
+        """在本账户的REST线程池中执行阻塞调用"""
+        self._last_rest_time = time.monotonic()
+        return await asyncio.get_running_loop().run_in_executor(self._rest_executor, func, *args)
+
+    async def _rest_keepalive_loop(self):
+        """REST空闲时定期ping，保持连接池中的TLS连接可用，避免下单时重新握手"""
+        while self.websocket_running:
+            await asyncio.sleep(REST_KEEPALIVE_INTERVAL)
+            if time.monotonic() - self._last_rest_time < REST_KEEPALIVE_INTERVAL:
+                continue
+            try:
+                await self._run_rest(self.exchange.fapiPublicGetPing)
+            except Exception as e:
+                self.logger.debug("REST保活ping失败: %s", e)
+
+    async def place_order_async(self, order_candidate: OrderCandidate) -> Optional[Dict[str, Any]]:
+        """异步下单"""
+        return await self._run_rest(self.place_order, order_candidate)
+
+    async def cancel_order_async(self, order_id: str) -> bool:
+        """异步撤销订单"""
+        return await self._run_rest(self.cancel_order, order_id)
+
+    async def cancel_orders_batch_async(self, order_ids: Sequence[str]) -> List[str]:
+        """异步批量撤销指定订单"""
+        return await self._run_rest(self.cancel_orders_batch, order_ids)
+
+    async def get_balance_async(self, asset: str = None) -> Dict[str, Decimal]:
+        """异步获取账户余额，BALANCE_CACHE_TTL内的重复查询直接返回上次结果"""
+        asset = asset or self.contract_type
+        now = time.monotonic()
+        cached = self._balance_cache.get(asset)
+        if cached and now - cached[0] < BALANCE_CACHE_TTL:
+            return cached[1]
+
+        balance = await self._run_rest(self.get_balance, asset)
+        self._balance_cache[asset] = (now, balance)
+        return balance
+
+    async def ping_rest_async(self) -> bool:
+        """异步检查REST连接"""
+        return await self._run_rest(self.ping_rest)
+
+    async def update_order_status_async(self, force: bool = False):
+        """异步更新挂单状态统计"""
+        return await self._run_rest(self.update_order_status, force)
+
+    async def cancel_all_orders_async(self) -> bool:
+        """异步撤销所有挂单"""
+        return await self._run_rest(self.cancel_all_orders)
+
+    async def close_all_positions_async(self) -> bool:
+        """异步平掉所有持仓（多空两侧的市价单并发下达）"""
+        try:
+            long_pos, short_pos = await self.get_positions_async()
+
+            results = await asyncio.gather(*(
+                self.place_order_async(order_candidate)
+                for order_candidate in self._close_position_candidates(long_pos, short_pos)
+            ))
+            success = all(results)
+
+            self.logger.info(f"平掉所有持仓: 多头={long_pos}, 空头={short_pos}, 成功={success}")
+            return success
+
+        except Exception as e:
+            self.logger.error(f"平掉所有持仓失败: {e}")
+            return False
+
+    async def get_order_status_async(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """异步获取订单状态"""
+        return await self._run_rest(self.get_order_status, order_id)
+
+    async def get_multiple_order_status_async(self, order_ids: Collection[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """异步批量获取订单状态，allOrders未覆盖的订单并发逐个查询"""
+        if not order_ids:
+            return {}
+
+        results = await self._run_rest(self._fetch_orders_since, order_ids)
+        missing = [order_id for order_id in order_ids if order_id not in results]
+        if missing:
+            statuses = await asyncio.gather(*(self._fetch_order_with_backoff(order_id) for order_id in missing))
+            results.update(zip(missing, statuses))
+        return results
+
+    async def _fetch_order_with_backoff(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """查询单个订单，遇到限频（429/418）时指数退避重试"""
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            try:
+                return await self._run_rest(self.exchange.fetch_order, order_id, self.trading_pair)
+            except ccxt.DDoSProtection as e:
+                if attempt == RATE_LIMIT_RETRIES:
+                    self.logger.error(f"获取订单状态失败 {order_id}: 多次触发限频 {e}")
+                    return None
+                delay = RATE_LIMIT_BACKOFF_BASE * 2 ** attempt
+                self.logger.warning(f"获取订单状态触发限频 {order_id}，{delay:.1f}秒后重试")
+                await asyncio.sleep(delay)
+            except Exception as e:
+                self.logger.error(f"获取订单状态失败 {order_id}: {e}")
+                return None
+
+    async def get_open_orders_async(self) -> List[Dict[str, Any]]:
+        """异步获取当前所有挂单"""
+        return await self._run_rest(self.get_open_orders)
+
+    def get_cached_positions(self) -> Tuple[Decimal, Decimal]:
+        """读取由用户数据流维护的持仓缓存，不发起REST请求"""
+        return self.long_position, self.short_position
+
+    async def get_positions_async(self) -> Tuple[Decimal, Decimal]:
+        """异步获取当前持仓"""
+        return await self._run_rest(self.get_positions)
+
+    async def snapshot(self) -> Tuple[List[Dict[str, Any]], Decimal, Decimal]:
+        """并发查询挂单和当前交易对持仓，返回 (挂单, 多头持仓, 空头持仓)"""
+        orders, (long_pos, short_pos) = await asyncio.gather(
+            self.get_open_orders_async(), self.get_positions_async()
+        )
+        return orders, long_pos, short_pos
+
+    async def verify_cleanup_async(self) -> bool:
+        """异步验证清理结果"""
+        return await self._run_rest(self.verify_cleanup)
+
+    def ping_rest(self) -> bool:
+        """通过REST请求检查与交易所的连接（会产生一次网络往返，不要在热路径上调用）"""
         try:
             # 尝试获取服务器时间来测试连接
             self.exchange.fetch_time()
@@ -871,6 +1242,7 @@ class BinanceConnector:
     async def start_event_listening(self):
         """启动事件监听（如果配置了事件队列）"""
         if self.event_queue is not None:
+            self._ensure_listen_key_keepalive()
             self.user_data_stream_task = asyncio.create_task(self._user_data_stream_loop())
             self.logger.info("用户数据流事件监听已启动")
 
@@ -884,19 +1256,37 @@ class BinanceConnector:
                 pass
             self.logger.info("用户数据流事件监听已停止")
 
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """获取listenKey请求使用的aiohttp会话（惰性创建，整个生命周期复用连接）"""
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=HTTP_POOL_SIZE,
+                    ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+                    keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+                    enable_cleanup_closed=True,
+                ),
+                headers={'X-MBX-APIKEY': self.api_key},
+                timeout=aiohttp.ClientTimeout(total=LISTEN_KEY_TIMEOUT)
+            )
+        return self._http_session
+
+    async def _listen_key_request(self, method: str) -> Dict[str, Any]:
+        """直接异步调用listenKey接口（只需API Key，无需签名）"""
+        url = f"{self.exchange.urls['api']['fapiPrivate']}/listenKey"
+        async with self._get_http_session().request(method, url) as response:
+            response.raise_for_status()
+            return await response.json()
+
     async def _get_listen_key(self) -> Optional[str]:
         """获取用户数据流的listen key"""
         try:
-            # 使用ccxt的私有API获取listen key
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.exchange.fapiPrivatePostListenKey()
-            )
+            response = await self._listen_key_request('POST')
             listen_key = response.get('listenKey')
             if listen_key:
                 self._listen_key = listen_key
-                self._listen_key_last_update = time.time()
-                self.logger.debug(f"获取到listen key: {listen_key[:10]}...")
+                self._listen_key_last_update = time.monotonic()
+                self.logger.debug("获取到listen key: %s...", listen_key[:10])
                 return listen_key
         except Exception as e:
             self.logger.error(f"获取listen key失败: {e}")
@@ -906,11 +1296,8 @@ class BinanceConnector:
         """保持listen key活跃"""
         try:
             if self._listen_key:
-                await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.exchange.fapiPrivatePutListenKey({'listenKey': self._listen_key})
-                )
-                self._listen_key_last_update = time.time()
+                await self._listen_key_request('PUT')
+                self._listen_key_last_update = time.monotonic()
                 self.logger.debug("Listen key已续期")
         except Exception as e:
             self.logger.error(f"续期listen key失败: {e}")
@@ -919,6 +1306,7 @@ class BinanceConnector:
         """用户数据流监听循环"""
         retry_count = 0
         max_retries = 10
+        backoff = RECONNECT_BACKOFF_BASE
 
         while retry_count < max_retries:
             try:
@@ -936,35 +1324,48 @@ class BinanceConnector:
                 async with websockets.connect(ws_url) as websocket:
                     self.logger.info("用户数据流WebSocket连接已建立")
                     retry_count = 0  # 重置重试计数
+                    backoff = RECONNECT_BACKOFF_BASE
 
-                    # 启动心跳任务
-                    heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+                    self.user_stream_last_message_time = time.monotonic()
 
-                    try:
-                        while True:
-                            # 接收消息
-                            message = await asyncio.wait_for(websocket.recv(), timeout=30)
-                            data = json.loads(message)
+                    # 看门狗任务随连接结束一起取消并等待退出（listenKey由连接器级的保活任务统一续期）
+                    async with asyncio.TaskGroup() as tg:
+                        # 接收超时由看门狗统一检查，避免每帧wait_for创建计时任务
+                        watchdog_task = tg.create_task(self._heartbeat_watchdog(
+                            websocket, 'user_stream_last_message_time', USER_STREAM_TIMEOUT))
 
-                            # 处理消息
-                            await self._handle_user_data_message(data)
+                        try:
+                            async for message in websocket:
+                                self.user_stream_last_message_time = time.monotonic()
 
-                    except asyncio.TimeoutError:
-                        self.logger.warning("用户数据流接收超时，准备重连")
-                        break
-                    except websockets.exceptions.ConnectionClosed:
-                        self.logger.warning("用户数据流连接关闭，准备重连")
-                        break
-                    finally:
-                        heartbeat_task.cancel()
+                                # 先按事件类型过滤，只解析需要处理的消息
+                                if _peek_event_type(message) not in _USER_EVENT_TYPES:
+                                    continue
+
+                                # 处理消息
+                                await self._handle_user_data_message(_json_loads(message))
+
+                            self.logger.warning("用户数据流连接关闭，准备重连")
+
+                        except websockets.exceptions.ConnectionClosed:
+                            self.logger.warning("用户数据流连接关闭，准备重连")
+                        finally:
+                            watchdog_task.cancel()
 
             except Exception as e:
                 self.logger.error(f"用户数据流连接异常: {e}")
                 retry_count += 1
-                await asyncio.sleep(min(retry_count * 2, 30))  # 指数退避
+                # 去相关抖动退避，避免多个账户在服务恢复时同时重连
+                backoff = min(RECONNECT_BACKOFF_CAP, random.uniform(RECONNECT_BACKOFF_BASE, backoff * 3))
+                await asyncio.sleep(backoff)
 
         self.logger.error("用户数据流连接达到最大重试次数，停止监听")
 
+    def _ensure_listen_key_keepalive(self):
+        """启动listenKey保活任务（每个连接器只运行一个）"""
+        if self.listen_key_task is None or self.listen_key_task.done():
+            self.listen_key_task = asyncio.create_task(self._heartbeat_loop())
+
     async def _heartbeat_loop(self):
         """心跳循环，定期续期listen key"""
         try:
@@ -996,50 +1397,77 @@ class BinanceConnector:
         except Exception as e:
             self.logger.error(f"处理用户数据消息失败: {e}")
 
+    def add_order_update_listener(self, listener: Callable[[], None]):
+        """注册订单更新回调（收到订单事件时同步调用，用于唤醒执行器）"""
+        self._order_update_listeners.append(listener)
+
     async def _handle_order_update(self, order_data: Dict[str, Any]):
         """处理订单更新事件"""
         try:
+            # 增量更新挂单统计
+            self._track_order_quantity(order_data)
+
+            for listener in self._order_update_listeners:
+                listener()
+
             if self.event_queue:
                 # 构建事件对象
-                event = {
-                    "event_type": "ORDER_UPDATE",
-                    "account_name": self.account_name,
-                    "data": order_data,
-                    "timestamp": time.time()
-                }
+                event = OrderEvent("ORDER_UPDATE", self.account_name, self._event_seq, time.time_ns(), order_data)
+                self._event_seq += 1
 
-                # 将事件放入队列
-                await self.event_queue.put(event)
+                # 将事件放入队列（不等待，队列满时丢弃最旧事件）
+                self._put_event(event)
 
-                # 记录日志
-                client_order_id = order_data.get('c', 'unknown')
-                status = order_data.get('X', 'unknown')
-                self.logger.debug(f"订单事件已推送: {client_order_id} -> {status}")
+                # 记录日志（仅在DEBUG级别启用时格式化）
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug("订单事件已推送: %s -> %s",
+                                      order_data.get('c', 'unknown'), order_data.get('X', 'unknown'))
 
         except Exception as e:
             self.logger.error(f"处理订单更新事件失败: {e}")
 
+    def _put_event(self, event: OrderEvent):
+        """非阻塞推送事件；队列已满时丢弃最旧的事件并插入GAP标记，由消费者触发REST对账"""
+        try:
+            self.event_queue.put_nowait(event)
+            return
+        except asyncio.QueueFull:
+            pass
+
+        # 腾出GAP标记和新事件的位置
+        for _ in range(2):
+            self.event_queue.get_nowait()
+
+        self.logger.warning(f"事件队列已满，丢弃最旧事件 (seq={event.seq})")
+        self.event_queue.put_nowait(OrderEvent("GAP", self.account_name, event.seq, event.timestamp))
+        self.event_queue.put_nowait(event)
+
     def _handle_account_update(self, account_data: Dict[str, Any]):
         """处理账户更新事件"""
         try:
-            # 更新持仓信息
-            positions = account_data.get('P', [])
-            for pos in positions:
-                symbol = pos.get('s', '')
-                if symbol == self.trading_pair.replace('/', '').replace(':USDC', ''):
-                    position_amt = Decimal(str(pos.get('pa', '0')))
-                    if position_amt > 0:
-                        self.long_position = position_amt
-                        self.short_position = Decimal("0")
-                    elif position_amt < 0:
-                        self.short_position = abs(position_amt)
-                        self.long_position = Decimal("0")
-                    else:
-                        self.long_position = Decimal("0")
-                        self.short_position = Decimal("0")
+            # 更新持仓信息（双向持仓模式下LONG/SHORT分别推送）
+            updated = False
+            for pos in account_data.get('P', []):
+                if pos.get('s') != self._market_id:
+                    continue
+                # 'pa'为字符串，直接解析
+                position_amt = Decimal(pos.get('pa', '0'))
+                position_side = pos.get('ps')
+                if position_side == 'LONG':
+                    self.long_position = position_amt
+                elif position_side == 'SHORT':
+                    self.short_position = -position_amt
+                elif position_amt > 0:
+                    self.long_position, self.short_position = position_amt, _D0
+                elif position_amt < 0:
+                    self.long_position, self.short_position = _D0, -position_amt
+                else:
+                    self.long_position = self.short_position = _D0
+                updated = True
 
-                    self.logger.debug(f"持仓更新: 多头={self.long_position}, 空头={self.short_position}")
-                    break
+            if updated:
+                self.position_version += 1
+                self.logger.debug("持仓更新: 多头=%s, 空头=%s", self.long_position, self.short_position)
 
         except Exception as e:
             self.logger.error(f"处理账户更新事件失败: {e}")
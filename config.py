@@ -1,8 +1,11 @@
 # dual_grid_bot/config.py
 
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from decimal import Decimal
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Any, Final, Mapping
 from dotenv import load_dotenv
 
 # 加载环境变量
@@ -13,18 +16,18 @@ load_dotenv()
 # ==============================================================================
 
 # 账户A配置 (多头网格)
-ACCOUNT_A_CONFIG = {
+ACCOUNT_A_CONFIG = MappingProxyType({
     "api_key": os.getenv("ACCOUNT_A_API_KEY", ""),  # 从环境变量读取
     "api_secret": os.getenv("ACCOUNT_A_API_SECRET", ""),  # 从环境变量读取
     "name": "Account_A_Long"  # 账户标识名称
-}
+})
 
 # 账户B配置 (空头网格)
-ACCOUNT_B_CONFIG = {
+ACCOUNT_B_CONFIG = MappingProxyType({
     "api_key": os.getenv("ACCOUNT_B_API_KEY", ""),  # 从环境变量读取
     "api_secret": os.getenv("ACCOUNT_B_API_SECRET", ""),  # 从环境变量读取
     "name": "Account_B_Short"  # 账户标识名称
-}
+})
 
 # ==============================================================================
 # 网格策略配置
@@ -36,7 +39,7 @@ CONTRACT_TYPE = "USDC"  # 合约类型：USDT 或 USDC
 LEVERAGE = 20  # 杠杆倍数
 
 # 网格参数配置
-GRID_CONFIG = {
+GRID_CONFIG = MappingProxyType({
     # 网格边界
     "start_price": Decimal("0.24800"),  # 网格起始价格
     "end_price": Decimal("0.27800"),    # 网格结束价格
@@ -62,50 +65,50 @@ GRID_CONFIG = {
     # 事件驱动模式配置
     "event_driven_enabled": False,        # 暂时禁用事件驱动模式（开发中）
     "fallback_sync_interval": 30,         # 备用轮询间隔（秒）
-}
+})
 
 # ==============================================================================
 # 系统配置
 # ==============================================================================
 
 # 交易所配置
-EXCHANGE_CONFIG = {
+EXCHANGE_CONFIG = MappingProxyType({
     "sandbox": False,  # 是否使用沙盒环境
     "timeout": 30000,  # API超时时间(毫秒)
     "rateLimit": 1200,  # API限速(毫秒)
     "enableRateLimit": True,  # 是否启用限速
-}
+})
 
 # 风控配置
-RISK_CONFIG = {
+RISK_CONFIG = MappingProxyType({
     "position_threshold": Decimal("500"),  # 持仓阈值
     "max_position_limit": Decimal("1000"),  # 最大持仓限制
     "order_timeout": 300,  # 订单超时时间(秒)
     "balance_check_interval": 60,  # 余额检查间隔(秒)
-}
+})
 
 # 监控配置
-MONITOR_CONFIG = {
+MONITOR_CONFIG = MappingProxyType({
     "update_interval": 1.0,  # 执行器更新间隔(秒)
     "sync_interval": 10,  # 状态同步间隔(秒)
     "heartbeat_interval": 30,  # 心跳检查间隔(秒)
     "max_retries": 3,  # 最大重试次数
-}
+})
 
 # 日志配置
-LOG_CONFIG = {
+LOG_CONFIG = MappingProxyType({
     "level": "INFO",  # 日志级别
     "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     "file_path": "logs/dual_grid_bot.log",  # 日志文件路径
     "max_file_size": 10 * 1024 * 1024,  # 最大文件大小(10MB)
     "backup_count": 5,  # 备份文件数量
-}
+})
 
 # ==============================================================================
 # 辅助函数
 # ==============================================================================
 
-def get_account_config(account_name: str) -> Dict[str, Any]:
+def get_account_config(account_name: str) -> Mapping[str, Any]:
     """获取指定账户的配置"""
     if account_name.upper() == "A":
         return ACCOUNT_A_CONFIG
@@ -114,8 +117,9 @@ def get_account_config(account_name: str) -> Dict[str, Any]:
     else:
         raise ValueError(f"Unknown account name: {account_name}")
 
+@lru_cache(maxsize=1)
 def validate_config() -> bool:
-    """验证配置的有效性"""
+    """验证配置的有效性（配置只读，每个进程只需校验一次，结果缓存）"""
     # 检查API密钥是否已设置
     if not ACCOUNT_A_CONFIG["api_key"] or not ACCOUNT_A_CONFIG["api_secret"]:
         raise ValueError("Account A API credentials not configured")
@@ -123,36 +127,76 @@ def validate_config() -> bool:
     if not ACCOUNT_B_CONFIG["api_key"] or not ACCOUNT_B_CONFIG["api_secret"]:
         raise ValueError("Account B API credentials not configured")
     
-    # 检查网格参数
-    if GRID_CONFIG["start_price"] >= GRID_CONFIG["end_price"]:
+    # 网格参数已在导入时由_build_grid_params校验
+    return True
+
+
+@dataclass(frozen=True, slots=True)
+class GridParams:
+    """导入时校验并预计算的网格参数（只读）"""
+    start_price: Decimal
+    end_price: Decimal
+    total_amount_quote: Decimal
+    min_spread: Decimal
+    grid_range: Decimal  # 网格范围相对起始价格的比例
+    max_levels_by_spread: int  # 按最小价差可容纳的最大层级数
+
+
+def _build_grid_params() -> GridParams:
+    """校验网格参数并计算与行情无关的派生值"""
+    start_price = GRID_CONFIG["start_price"]
+    end_price = GRID_CONFIG["end_price"]
+    total_amount_quote = GRID_CONFIG["total_amount_quote"]
+    min_spread = GRID_CONFIG["min_spread_between_orders"]
+
+    if start_price >= end_price:
         raise ValueError("Start price must be less than end price")
-    
-    if GRID_CONFIG["total_amount_quote"] <= 0:
+
+    if total_amount_quote <= 0:
         raise ValueError("Total amount must be positive")
-    
+
     if GRID_CONFIG["max_open_orders"] <= 0:
         raise ValueError("Max open orders must be positive")
-    
-    return True
+
+    grid_range = (end_price - start_price) / start_price
+
+    return GridParams(
+        start_price=start_price,
+        end_price=end_price,
+        total_amount_quote=total_amount_quote,
+        min_spread=min_spread,
+        grid_range=grid_range,
+        max_levels_by_spread=int(grid_range / min_spread)
+    )
 
 # ==============================================================================
 # 配置导出
 # ==============================================================================
 
-# 将所有配置合并为一个字典，方便导入使用
-ALL_CONFIG = {
-    "accounts": {
+GRID_PARAMS: Final[GridParams] = _build_grid_params()
+
+# 常用配置项导出为模块级常量，使用处直接导入，无需逐级字典查找
+START_PRICE = GRID_CONFIG["start_price"]
+END_PRICE = GRID_CONFIG["end_price"]
+GRID_SPREAD = GRID_CONFIG["min_spread_between_orders"]
+LOG_LEVEL = LOG_CONFIG["level"]
+LOG_FORMAT = LOG_CONFIG["format"]
+LOG_FILE_PATH = LOG_CONFIG["file_path"]
+
+# 将所有配置合并为一个只读字典，方便导入使用（运行期间配置不可修改）
+ALL_CONFIG = MappingProxyType({
+    "accounts": MappingProxyType({
         "A": ACCOUNT_A_CONFIG,
         "B": ACCOUNT_B_CONFIG
-    },
-    "trading": {
+    }),
+    "trading": MappingProxyType({
         "pair": TRADING_PAIR,
         "contract_type": CONTRACT_TYPE,
         "leverage": LEVERAGE
-    },
+    }),
     "grid": GRID_CONFIG,
     "exchange": EXCHANGE_CONFIG,
     "risk": RISK_CONFIG,
     "monitor": MONITOR_CONFIG,
     "log": LOG_CONFIG
-}
+})
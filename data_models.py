@@ -1,10 +1,37 @@
 # dual_grid_bot/data_models.py
 
+from dataclasses import dataclass, field
 from decimal import Decimal
 from enum import Enum
+from functools import lru_cache
 from typing import Optional, Dict, Any
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, Field
+
+
+# 是否保留交易所返回的完整订单数据（调试用）；默认只保留状态和累计成交数量
+KEEP_RAW_ORDER_INFO = False
+
+
+@lru_cache(maxsize=1024)
+def _str_to_decimal(value: str) -> Decimal:
+    """缓存字符串到Decimal的转换（成交数量/金额在事件流中大量重复）"""
+    return Decimal(value)
+
+
+def to_decimal(value: Any) -> Decimal:
+    """
+    数值转Decimal，替代Decimal(str(x))：
+    Decimal原样返回，字符串直接解析（带缓存），整数精确转换，浮点数经str()避免二进制误差
+    """
+    value_type = type(value)
+    if value_type is Decimal:
+        return value
+    if value_type is str:
+        return _str_to_decimal(value)
+    if value_type is int:
+        return Decimal(value)
+    return _str_to_decimal(str(value))
 
 
 # ==============================================================================
@@ -94,7 +121,15 @@ class GridLevelStates(Enum):
     COMPLETE = "COMPLETE"              # 平仓单已成交，一个完整的循环结束
 
 
-class TrackedOrder(BaseModel):
+class OrderUpdateResult(Enum):
+    """订单数据更新结果"""
+    UPDATED = "UPDATED"      # 订单状态或成交有变化
+    UNCHANGED = "UNCHANGED"  # 重复数据，无需重新处理
+    FAILED = "FAILED"        # 数据解析失败
+
+
+@dataclass(slots=True, kw_only=True)
+class TrackedOrder:
     """
     一个简化的订单追踪模型，用于GridLevel。
     它存储了在途或已完成订单的关键信息。
@@ -117,10 +152,16 @@ class TrackedOrder(BaseModel):
     # 费用信息
     cum_fees_quote: Decimal = Decimal("0")
     
-    # 用于存储从交易所返回的原始订单信息，方便调试
-    raw_info: Dict[str, Any] = {}
+    # 交易所返回的订单信息；默认只保留状态和累计成交数量，调试时可保留完整数据
+    raw_info: Dict[str, Any] = field(default_factory=dict)
 
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    # 价格的浮点副本，用于距离比较等不涉及下单精度的计算
+    price_f: float = field(init=False, repr=False, default=0.0)
+
+    def __post_init__(self):
+        self.price_f = float(self.price)
+        if self.raw_info and not KEEP_RAW_ORDER_INFO:
+            self.raw_info = {"status": self.raw_info.get("status"), "filled": self.raw_info.get("filled")}
 
     @property
     def status(self) -> str:
@@ -129,7 +170,7 @@ class TrackedOrder(BaseModel):
             return self.raw_info['status']
         return "unknown"
 
-    def update_from_exchange_data(self, order_data: Dict[str, Any]) -> bool:
+    def update_from_exchange_data(self, order_data: Dict[str, Any]) -> OrderUpdateResult:
         """从交易所数据更新订单状态，支持REST API和WebSocket事件"""
         try:
             # 处理不同格式的订单数据
@@ -145,33 +186,46 @@ class TrackedOrder(BaseModel):
                 filled_quote = order_data.get('cost', '0')
                 client_order_id = order_data.get('clientOrderId', '')
 
+            is_filled = status in ['CLOSED', 'FILLED']
+            is_done = status in ['CLOSED', 'FILLED', 'CANCELED', 'EXPIRED']
+
+            # 完成标记和累计成交都未变化的重复数据无需重新处理
+            # （按归一化后的字段比较，WebSocket与REST的状态名和数量类型不同）
+            filled_base = to_decimal(filled_qty) if filled_qty else Decimal("0")
+            if (is_filled == self.is_filled and is_done == self.is_done
+                    and filled_base == self.executed_amount_base):
+                return OrderUpdateResult.UNCHANGED
+
             # 更新状态
-            self.is_filled = status in ['CLOSED', 'FILLED']
-            self.is_done = status in ['CLOSED', 'FILLED', 'CANCELED', 'EXPIRED']
+            self.is_filled = is_filled
+            self.is_done = is_done
 
             # 更新client_order_id（如果还没有的话）
             if client_order_id and not self.client_order_id:
                 self.client_order_id = client_order_id
 
-            # 更新成交数量和金额
-            if filled_qty:
-                self.executed_amount_base = Decimal(str(filled_qty))
-            if filled_quote:
-                self.executed_amount_quote = Decimal(str(filled_quote))
+            # 更新成交数量和金额（未成交的"0"直接跳过）
+            if filled_base:
+                self.executed_amount_base = filled_base
+            if filled_quote and filled_quote != "0":
+                self.executed_amount_quote = to_decimal(filled_quote)
 
             # 更新手续费（WebSocket和REST格式不同）
             if 'fee' in order_data and order_data['fee']:
                 fee_info = order_data['fee']
                 if 'cost' in fee_info:
-                    self.cum_fees_quote = Decimal(str(fee_info['cost']))
+                    self.cum_fees_quote = to_decimal(fee_info['cost'])
 
-            # 更新原始信息
-            self.raw_info = order_data
-            return True
+            # 更新订单信息（默认不保留整个原始payload）
+            if KEEP_RAW_ORDER_INFO:
+                self.raw_info = order_data
+            else:
+                self.raw_info = {"status": status, "filled": filled_qty}
+            return OrderUpdateResult.UPDATED
 
         except Exception as e:
             # 如果更新失败，记录错误但不抛出异常
-            return False
+            return OrderUpdateResult.FAILED
 
     @property
     def is_partially_filled(self) -> bool:
@@ -191,7 +245,8 @@ class TrackedOrder(BaseModel):
         return Decimal("0")
 
 
-class GridLevel(BaseModel):
+@dataclass(slots=True, kw_only=True, eq=False)
+class GridLevel:
     """
     代表网格中的单一层级，与Hummingbot模型高度兼容。
     """
@@ -207,47 +262,24 @@ class GridLevel(BaseModel):
     active_close_order: Optional[TrackedOrder] = None
     state: GridLevelStates = GridLevelStates.NOT_ACTIVE
 
-    model_config = ConfigDict(arbitrary_types_allowed=True)
-
-    def update_state(self):
-        """根据关联订单的状态更新层级的生命周期状态。"""
-        old_state = self.state
-
-        if self.active_open_order is None:
-            # 没有开仓订单 -> 未激活状态
-            self.state = GridLevelStates.NOT_ACTIVE
-
-        elif not self.active_open_order.is_done:
-            # 开仓订单存在但未完成 -> 开仓订单已下达状态
-            self.state = GridLevelStates.OPEN_ORDER_PLACED
-
-        elif self.active_open_order.is_filled:
-            # 开仓订单已成交
-            if self.active_close_order is None:
-                # 没有平仓订单 -> 开仓订单已成交状态
-                self.state = GridLevelStates.OPEN_ORDER_FILLED
-
-            elif not self.active_close_order.is_done:
-                # 平仓订单存在但未完成 -> 平仓订单已下达状态
-                self.state = GridLevelStates.CLOSE_ORDER_PLACED
+    # 价格的浮点副本，用于激活边界过滤和排序
+    price_f: float = field(init=False, repr=False, default=0.0)
 
-            elif self.active_close_order.is_filled:
-                # 平仓订单已成交 -> 完成状态
-                self.state = GridLevelStates.COMPLETE
+    def __post_init__(self):
+        self.price_f = float(self.price)
 
-            else:
-                # 平仓订单被取消或失败 -> 回到开仓订单已成交状态
-                self.state = GridLevelStates.OPEN_ORDER_FILLED
+    def update_state(self):
+        """根据关联订单的状态更新层级的生命周期状态（查状态转移表）。"""
+        open_order = self.active_open_order
+        close_order = self.active_close_order
 
-        else:
-            # 开仓订单被取消或失败 -> 回到未激活状态
-            self.state = GridLevelStates.NOT_ACTIVE
+        key = 0
+        if open_order is not None:
+            key = 0b100000 | (open_order.is_done << 4) | (open_order.is_filled << 3)
+        if close_order is not None:
+            key |= 0b100 | (close_order.is_done << 1) | close_order.is_filled
 
-        # 记录状态变化
-        if old_state != self.state:
-            # 这里可以添加状态变化的日志，但为了避免过多日志，暂时注释
-            # print(f"层级 {self.id} 状态变化: {old_state.value} -> {self.state.value}")
-            pass
+        self.state = _LEVEL_STATE_TABLE[key]
 
     def reset_open_order(self):
         """当开仓单被取消或失败时，重置开仓订单状态。"""
@@ -266,11 +298,52 @@ class GridLevel(BaseModel):
         self.state = GridLevelStates.NOT_ACTIVE
 
 
+def _derive_level_state(key: int) -> GridLevelStates:
+    """
+    由订单状态位计算层级状态，位定义（高位到低位）：
+    开仓单存在、开仓单完成、开仓单成交、平仓单存在、平仓单完成、平仓单成交
+    """
+    open_present, open_done, open_filled = key & 0b100000, key & 0b10000, key & 0b1000
+    close_present, close_done, close_filled = key & 0b100, key & 0b10, key & 0b1
+
+    if not open_present:
+        # 没有开仓订单 -> 未激活状态
+        return GridLevelStates.NOT_ACTIVE
+
+    if not open_done:
+        # 开仓订单存在但未完成 -> 开仓订单已下达状态
+        return GridLevelStates.OPEN_ORDER_PLACED
+
+    if not open_filled:
+        # 开仓订单被取消或失败 -> 回到未激活状态
+        return GridLevelStates.NOT_ACTIVE
+
+    if not close_present:
+        # 没有平仓订单 -> 开仓订单已成交状态
+        return GridLevelStates.OPEN_ORDER_FILLED
+
+    if not close_done:
+        # 平仓订单存在但未完成 -> 平仓订单已下达状态
+        return GridLevelStates.CLOSE_ORDER_PLACED
+
+    if close_filled:
+        # 平仓订单已成交 -> 完成状态
+        return GridLevelStates.COMPLETE
+
+    # 平仓订单被取消或失败 -> 回到开仓订单已成交状态
+    return GridLevelStates.OPEN_ORDER_FILLED
+
+
+# 层级状态转移表，导入时预先计算全部64种订单状态组合
+_LEVEL_STATE_TABLE = tuple(_derive_level_state(key) for key in range(64))
+
+
 # ==============================================================================
 # 交易所交互 (BinanceConnector) 相关数据模型
 # ==============================================================================
 
-class TradingRule(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class TradingRule:
     """
     封装从交易所获取的交易规则，供GridExecutor在生成网格时使用。
     """
@@ -280,7 +353,9 @@ class TradingRule(BaseModel):
     min_notional_size: Decimal
     min_order_size: Decimal
 
-class OrderCandidate(BaseModel):
+
+@dataclass(slots=True, kw_only=True)
+class OrderCandidate:
     """
     一个标准化的订单候选对象。
     GridExecutor创建此对象，然后由BinanceConnector负责量化和执行。
@@ -292,4 +367,15 @@ class OrderCandidate(BaseModel):
     price: Decimal = Decimal("NaN") # 市价单价格可为NaN
     position_action: PositionAction
 
-    model_config = ConfigDict(arbitrary_types_allowed=True)
\ No newline at end of file
+
+@dataclass(slots=True)
+class OrderEvent:
+    """
+    BinanceConnector推送到事件队列的订单事件。
+    event_type为GAP时表示队列溢出丢弃了事件，data为空。
+    """
+    event_type: str
+    account_name: str
+    seq: int
+    timestamp: int  # 纳秒时间戳
+    data: Optional[Dict[str, Any]] = None
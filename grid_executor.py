@@ -2,17 +2,60 @@
 
 import asyncio
 import logging
-import math
-import time
-from decimal import Decimal
-from typing import Dict, List, Optional, Any
+import numpy as np
+from decimal import Decimal, ROUND_FLOOR
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any, Set, Tuple
 from enum import Enum
 
 from data_models import (
     GridExecutorConfig, GridLevel, GridLevelStates, TrackedOrder,
-    TradeType, OrderType, PositionAction, OrderCandidate
+    TradeType, OrderType, PositionAction, OrderCandidate, OrderUpdateResult
 )
-from binance_connector import BinanceConnector
+from binance_connector import BinanceConnector, BATCH_CANCEL_LIMIT
+
+try:
+    from numba import njit
+except ImportError:  # numba未安装时激活候选选择使用纯NumPy实现
+    njit = None
+
+# 单个执行器同时在途的下单/撤单请求上限
+MAX_CONCURRENT_ORDER_REQUESTS = 5
+
+# 一轮待撤订单数达到该值时改用批量撤单接口
+BATCH_CANCEL_THRESHOLD = 3
+
+# 层级状态在状态数组中的整数编码
+_STATES = tuple(GridLevelStates)
+_STATE_CODES = {state: code for code, state in enumerate(_STATES)}
+_NOT_ACTIVE_CODE = _STATE_CODES[GridLevelStates.NOT_ACTIVE]
+
+
+def _floor_to_increment(amount: Decimal, increment: Decimal) -> Decimal:
+    """按数量增量向下取整（精确Decimal运算，避免浮点误差多进一档）"""
+    return int((amount / increment).to_integral_value(rounding=ROUND_FLOOR)) * increment
+
+
+def _min_base_for_notional(notional: Decimal, price: Decimal, increment: Decimal) -> Decimal:
+    """
+    满足最小名义价值的最小基础数量：先向下取整到增量，
+    名义价值不足时再加一个增量（与Hummingbot的处理一致）
+    """
+    base_amount = _floor_to_increment(notional / price, increment)
+    if base_amount * price < notional:
+        base_amount += increment
+    return base_amount
+
+
+def _activation_candidates(prices: np.ndarray, states: np.ndarray, not_active_code: int,
+                           lo: float, hi: float, mid: float) -> np.ndarray:
+    """选出价格在[lo, hi]内的未激活层级，按与中间价的距离排序后返回下标"""
+    idx = np.flatnonzero((states == not_active_code) & (prices >= lo) & (prices <= hi))
+    return idx[np.argsort(np.abs(prices[idx] - mid), kind="mergesort")]
+
+
+if njit is not None:
+    _activation_candidates = njit(cache=True)(_activation_candidates)
 
 
 class RunnableStatus(Enum):
@@ -36,7 +79,8 @@ class GridExecutor:
     """
     
     def __init__(self, config: GridExecutorConfig, connector: BinanceConnector, 
-                 update_interval: float = 1.0, max_retries: int = 10):
+                 update_interval: float = 1.0, max_retries: int = 10,
+                 mid_price: Optional[Decimal] = None):
         """
         初始化网格执行器
         
@@ -45,6 +89,7 @@ class GridExecutor:
             connector: 币安连接器实例
             update_interval: 更新间隔(秒)
             max_retries: 最大重试次数
+            mid_price: 生成网格使用的中间价，多个执行器可共用一次查询；为空时从连接器获取
         """
         self.config = config
         self.connector = connector
@@ -56,30 +101,86 @@ class GridExecutor:
         
         # 状态管理
         self._status = RunnableStatus.NOT_STARTED
-        self.close_type: Optional[CloseType] = None
+        self._close_type: Optional[CloseType] = None
         self._current_retries = 0
         
         # 获取交易规则
         self.trading_rules = connector.get_trading_rules()
         
         # 生成网格层级
-        self.grid_levels = self._generate_grid_levels()
-        self.levels_by_state = {state: [] for state in GridLevelStates}
+        if mid_price is None:
+            mid_price = connector.get_mid_price()
+        if mid_price <= 0:
+            raise ValueError("网格生成时获取到无效的中间价格")
+        self.grid_levels = self._generate_grid_levels(mid_price)
+        # 按状态分组的层级集合，只在层级状态变化时增量移动
+        self.levels_by_state: Dict[GridLevelStates, Set[GridLevel]] = {state: set() for state in GridLevelStates}
+        self.levels_by_state[GridLevelStates.NOT_ACTIVE].update(self.grid_levels)
+        # 层级价格和状态的并行数组，激活过滤和排序用向量运算完成
+        self._level_pos: Dict[str, int] = {level.id: i for i, level in enumerate(self.grid_levels)}
+        self._prices_f = np.array([level.price_f for level in self.grid_levels], dtype=np.float64)
+        self._states = np.full(len(self.grid_levels), _NOT_ACTIVE_CODE, dtype=np.int8)
+        # 订单有变化、需要重新计算状态的层级
+        self._level_dirty: Set[GridLevel] = set()
+
+        # 预分配的状态信息，get_status_info原地更新并返回只读视图
+        self._state_counts = {state.value: 0 for state in GridLevelStates}
+        self._status_info: Dict[str, Any] = {
+            "id": config.id,
+            "side": config.side.value,
+            "status": self._status.value,  # 状态字段只在变化时由_set_status/close_type写入
+            "close_type": None,
+            "grid_levels": len(self.grid_levels),
+            "levels_by_state": MappingProxyType(self._state_counts),
+            "position_size_base": 0.0,
+            "current_retries": 0,
+            "max_retries": max_retries,
+        }
+        self._status_info_view = MappingProxyType(self._status_info)
         
         # 订单追踪
         self._filled_orders = []
+        self._order_index: Dict[str, Tuple[GridLevel, str]] = {}  # 订单ID -> (层级, "open"/"close")
 
         # 网格参数
         self.step = Decimal("0")
 
         # 基础持仓数据
         self.position_size_base = Decimal("0")
+        self._seen_position_version = -1  # 已读取的连接器持仓版本，-1表示尚未初始化
+
+        # 每轮控制开始时的中间价快照，本轮内的过滤/排序/撤单判断共用
+        self._tick_mid_price = Decimal("0")
+        self._tick_mid_price_f = 0.0
+        # 激活边界对应的绝对价格区间，每轮随中间价快照一起计算
+        self._bounds_lo = 0.0
+        self._bounds_hi = 0.0
+
+        # 距离比较使用浮点数，Decimal只用于下单价格和数量
+        self._activation_bounds_f = float(config.activation_bounds) if config.activation_bounds else 0.0
+
+        # 止盈价格和安全价差的乘数，方向固定后只需计算一次
+        if config.side == TradeType.BUY:
+            self._tp_factor = Decimal("1") + config.take_profit_pct
+            self._safe_spread_factor = Decimal("1") + config.safe_extra_spread
+        else:
+            self._tp_factor = Decimal("1") - config.take_profit_pct
+            self._safe_spread_factor = Decimal("1") - config.safe_extra_spread
+        self._tp_factor_f = float(self._tp_factor)
 
-        # 时间戳
-        self.max_open_creation_timestamp = 0
+        # 时间戳（事件循环时钟，在start中获取事件循环）
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.max_open_creation_timestamp = float("-inf")
 
         # 事件驱动相关
-        self.last_fallback_sync = 0  # 上次备用轮询时间
+        self.last_fallback_sync = float("-inf")  # 上次备用轮询时间
+        self._wake_event = asyncio.Event()  # 收到订单事件时提前唤醒控制循环
+        self._order_semaphore = asyncio.Semaphore(MAX_CONCURRENT_ORDER_REQUESTS)
+        self._inflight_orders: Set[asyncio.Task] = set()  # 进行中的下单/撤单任务（不随控制任务取消）
+        # 事件驱动模式下订单事件经队列交给process_event，处理完再唤醒；
+        # 否则由连接器收到订单事件时直接唤醒，控制循环再通过REST同步状态
+        if connector.event_queue is None:
+            connector.add_order_update_listener(self.notify_update)
         
         self.logger.info(f"网格执行器已初始化: {config.side.value} 方向, {len(self.grid_levels)} 个层级")
     
@@ -87,6 +188,21 @@ class GridExecutor:
     def status(self) -> RunnableStatus:
         """获取执行器状态"""
         return self._status
+
+    def _set_status(self, status: RunnableStatus):
+        """设置执行器状态并同步状态信息"""
+        self._status = status
+        self._status_info["status"] = status.value
+
+    @property
+    def close_type(self) -> Optional[CloseType]:
+        """获取关闭类型"""
+        return self._close_type
+
+    @close_type.setter
+    def close_type(self, close_type: Optional[CloseType]):
+        self._close_type = close_type
+        self._status_info["close_type"] = close_type.value if close_type else None
     
     @property
     def is_active(self) -> bool:
@@ -103,17 +219,12 @@ class GridExecutor:
         """获取中间价格"""
         return self.connector.get_mid_price()
     
-    def _generate_grid_levels(self) -> List[GridLevel]:
+    def _generate_grid_levels(self, price: Decimal) -> List[GridLevel]:
         """
-        生成网格层级 - 完整复刻Hummingbot的逻辑
+        按给定中间价生成网格层级 - 完整复刻Hummingbot的逻辑
         """
         grid_levels = []
         
-        # 获取当前价格
-        price = self.connector.get_mid_price()
-        if price <= 0:
-            raise ValueError("网格生成时获取到无效的中间价格")
-        
         # 获取最小名义价值和基础数量增量
         min_notional = max(
             self.config.min_order_amount_quote,
@@ -124,15 +235,8 @@ class GridExecutor:
         # 添加安全边际
         min_notional_with_margin = min_notional * Decimal("1.05")  # 5%安全边际
         
-        # 计算满足最小名义价值和量化要求的最小基础数量
-        min_base_amount = max(
-            min_notional_with_margin / price,
-            min_base_increment * Decimal(str(math.ceil(float(min_notional) / float(min_base_increment * price))))
-        )
-        
-        # 量化最小基础数量
-        min_base_amount = Decimal(
-            str(math.ceil(float(min_base_amount) / float(min_base_increment)))) * min_base_increment
+        # 计算满足最小名义价值（含安全边际）且已按增量量化的最小基础数量
+        min_base_amount = _min_base_for_notional(min_notional_with_margin, price, min_base_increment)
         
         # 验证量化后的数量满足最小名义价值
         min_quote_amount = min_base_amount * price
@@ -159,8 +263,7 @@ class GridExecutor:
             # 计算每层级的报价金额，确保量化后满足最小要求
             base_amount_per_level = max(
                 min_base_amount,
-                Decimal(str(math.floor(float(self.config.total_amount_quote / (price * n_levels)) /
-                                       float(min_base_increment)))) * min_base_increment
+                _floor_to_increment(self.config.total_amount_quote / (price * n_levels), min_base_increment)
             )
             quote_amount_per_level = base_amount_per_level * price
             
@@ -170,15 +273,13 @@ class GridExecutor:
         # 确保至少有一个层级
         n_levels = max(1, n_levels)
         
-        # 生成价格层级，均匀分布
-        if n_levels > 1:
-            prices = self._linear_distribution(n_levels, float(self.config.start_price), float(self.config.end_price))
-            self.step = grid_range / (n_levels - 1)
-        else:
-            # 单层级使用范围中点
-            mid_price_range = (self.config.start_price + self.config.end_price) / 2
-            prices = [mid_price_range]
-            self.step = grid_range
+        # 生成价格层级，均匀分布（单层级时取范围中点）
+        prices = self._linear_distribution(n_levels, float(self.config.start_price), float(self.config.end_price))
+        self.step = grid_range / (n_levels - 1) if n_levels > 1 else grid_range
+
+        # 一次性按最小价格变动单位量化所有层级价格
+        prices = self.connector.quantize_prices_batch(prices)
+        price_decimals = max(0, -self.trading_rules.min_price_increment.normalize().as_tuple().exponent)
         
         # 计算止盈
         take_profit_pct = self.config.take_profit_pct
@@ -188,7 +289,7 @@ class GridExecutor:
             grid_levels.append(
                 GridLevel(
                     id=f"L{i}",
-                    price=Decimal(str(level_price)),
+                    price=Decimal(f"{level_price:.{price_decimals}f}"),
                     amount_quote=quote_amount_per_level,
                     side=self.config.side,
                     order_type=self.config.order_type,
@@ -205,16 +306,31 @@ class GridExecutor:
         
         return grid_levels
     
-    def _linear_distribution(self, n: int, start: float, end: float) -> List[float]:
+    def _linear_distribution(self, n: int, start: float, end: float) -> np.ndarray:
         """线性分布生成价格点"""
         if n == 1:
-            return [(start + end) / 2]
+            return np.array([(start + end) / 2])
 
-        step = (end - start) / (n - 1)
-        return [start + i * step for i in range(n)]
+        return np.linspace(start, end, n)
 
     # ==================== 事件驱动相关方法 ====================
 
+    def notify_update(self):
+        """订单有更新，唤醒控制循环立即执行下一轮"""
+        self._wake_event.set()
+
+    async def wait_for_update(self):
+        """
+        等待下一轮控制：收到订单事件立即返回，否则最多等待update_interval秒；
+        返回时会清除唤醒标记，因此每个执行器只能有一个控制循环调用
+        """
+        try:
+            await asyncio.wait_for(self._wake_event.wait(), timeout=self.update_interval)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._wake_event.clear()
+
     def process_event(self, event_data: Dict[str, Any]):
         """处理单个订单事件的核心入口"""
         try:
@@ -238,12 +354,17 @@ class GridExecutor:
                 return  # 事件与此执行器无关
 
             # 使用新方法更新订单状态
-            if tracked_order.update_from_exchange_data(event_data):
+            result = tracked_order.update_from_exchange_data(event_data)
+            if result is OrderUpdateResult.UNCHANGED:
+                return  # 重复事件，已处理过
+            if result is OrderUpdateResult.UPDATED:
                 status = event_data.get('X', 'unknown')
                 self.logger.info(f"事件处理: 订单 {client_order_id} 状态更新为 {status}")
 
                 # 状态更新后，层级的状态机也会随之改变
                 target_level.update_state()
+                self._level_dirty.add(target_level)
+                self.notify_update()  # 状态已更新，唤醒控制循环按新状态执行
 
                 # 如果订单完成，记录相关信息
                 if tracked_order.is_filled:
@@ -288,15 +409,15 @@ class GridExecutor:
             if not pending_orders:
                 return
 
-            self.logger.debug(f"备用轮询: 检查 {len(pending_orders)} 个未完成订单")
+            self.logger.debug("备用轮询: 检查 %d 个未完成订单", len(pending_orders))
 
             # 批量查询订单状态
             for level, order in pending_orders:
                 if order.order_id:
-                    order_status = self.connector.get_order_status(order.order_id)
-                    if order_status:
-                        order.update_from_exchange_data(order_status)
+                    order_status = await self.connector.get_order_status_async(order.order_id)
+                    if order_status and order.update_from_exchange_data(order_status) is OrderUpdateResult.UPDATED:
                         level.update_state()
+                        self._level_dirty.add(level)
 
         except Exception as e:
             self.logger.error(f"备用轮询失败: {e}")
@@ -307,81 +428,96 @@ class GridExecutor:
         """
         try:
             # 1. 【可选，低频】执行备用轮询
-            current_time = time.time()
+            current_time = self._loop.time()
             if current_time - self.last_fallback_sync > 30:  # 每30秒执行一次备用轮询
                 await self.sync_orders_status_fallback()
                 self.last_fallback_sync = current_time
 
             # 2. 更新网格层级状态（基于可能已被事件更新的状态）
-            self.update_grid_levels()
+            await self.update_grid_levels()
 
             # 3. 更新基础指标
-            self.update_basic_metrics()
+            await self.update_basic_metrics()
 
             if self._status == RunnableStatus.RUNNING:
+                # 本轮统一使用同一个中间价
+                self._tick_mid_price = self.connector.get_mid_price()
+                self._tick_mid_price_f = float(self._tick_mid_price)
+                self._bounds_lo = self._tick_mid_price_f * (1 - self._activation_bounds_f)
+                self._bounds_hi = self._tick_mid_price_f * (1 + self._activation_bounds_f)
+
                 # 4. 获取需要创建和取消的订单 - 完全参考Hummingbot逻辑
                 open_orders_to_create = self.get_open_orders_to_create()
                 close_orders_to_create = self.get_close_orders_to_create()
                 open_order_ids_to_cancel = self.get_open_order_ids_to_cancel()
                 close_order_ids_to_cancel = self.get_close_order_ids_to_cancel()
 
-                # 5. 创建开仓订单（逐个检查，避免超过限制）
-                for level in open_orders_to_create:
-                    # 在每次下单前重新检查当前挂单数量
-                    current_open_orders = len([l for l in self.grid_levels
-                                             if l.state == GridLevelStates.OPEN_ORDER_PLACED])
-
-                    if current_open_orders >= self.config.max_open_orders:
-                        self.logger.debug(f"已达到最大挂单数量 {self.config.max_open_orders}，停止下单")
-                        break
-
-                    await self.adjust_and_place_open_order(level)
+                # 5. 创建开仓订单（按剩余额度截取后并发下单，避免超过限制）
+                current_open_orders = len(self.levels_by_state[GridLevelStates.OPEN_ORDER_PLACED])
+                budget = max(0, self.config.max_open_orders - current_open_orders)
+                if len(open_orders_to_create) > budget:
+                    self.logger.debug("已达到最大挂单数量 %d，本轮只下 %d 单", self.config.max_open_orders, budget)
+                await asyncio.gather(*(self._bounded(self.adjust_and_place_open_order(level))
+                                       for level in open_orders_to_create[:budget]))
 
                 # 6. 创建平仓订单（止盈单）
-                for level in close_orders_to_create:
-                    await self.adjust_and_place_close_order(level)
+                await asyncio.gather(*(self._bounded(self.adjust_and_place_close_order(level))
+                                       for level in close_orders_to_create))
 
-                # 7. 取消开仓订单
-                for order_id in open_order_ids_to_cancel:
-                    await self.cancel_order(order_id)
-
-                # 8. 取消平仓订单
-                for order_id in close_order_ids_to_cancel:
-                    await self.cancel_order(order_id)
+                # 7-8. 取消开仓订单和平仓订单
+                await self.cancel_orders(open_order_ids_to_cancel + close_order_ids_to_cancel)
 
             elif self._status == RunnableStatus.SHUTTING_DOWN:
                 # 关闭状态下，确保所有订单都被取消和所有持仓都被平掉
                 await self.cancel_open_orders()
                 await self.close_open_positions()
-                self._status = RunnableStatus.TERMINATED
+                self._set_status(RunnableStatus.TERMINATED)
 
         except Exception as e:
             self.logger.error(f"控制任务执行错误: {e}")
             self._current_retries += 1
             if self._current_retries >= self.max_retries:
                 self.logger.error(f"达到最大重试次数 ({self.max_retries})，正在关闭")
-                self._status = RunnableStatus.SHUTTING_DOWN
+                self._set_status(RunnableStatus.SHUTTING_DOWN)
 
-    def update_grid_levels(self):
-        """更新网格层级状态"""
-        self.levels_by_state = {state: [] for state in GridLevelStates}
+    async def _bounded(self, coro):
+        """限制同时在途的下单/撤单请求数量"""
+        # 排队等待名额时可被取消，此时请求尚未发出，直接放弃；
+        # 拿到名额后请求与名额一起受保护，完成后才释放名额
+        try:
+            await self._order_semaphore.acquire()
+        except asyncio.CancelledError:
+            coro.close()
+            raise
+        return await self._shielded(self._release_order_slot_after(coro))
 
-        # 更新每个层级的状态
-        for level in self.grid_levels:
-            # 检查开仓订单状态
-            if level.active_open_order:
-                self._update_order_status(level.active_open_order)
+    async def _release_order_slot_after(self, coro):
+        """执行已占用名额的请求，结束后释放名额"""
+        try:
+            return await coro
+        finally:
+            self._order_semaphore.release()
 
-            # 检查平仓订单状态
-            if level.active_close_order:
-                self._update_order_status(level.active_close_order)
+    def _shielded(self, coro):
+        """
+        REST请求与本地状态更新作为一个整体执行：控制任务被取消时，
+        已发出的下单/撤单仍会完成并记录结果，避免出现未记录的挂单
+        """
+        task = asyncio.ensure_future(coro)
+        self._inflight_orders.add(task)
+        task.add_done_callback(self._inflight_orders.discard)
+        return asyncio.shield(task)
 
-            # 更新层级状态
-            level.update_state()
-            self.levels_by_state[level.state].append(level)
+    async def update_grid_levels(self):
+        """更新网格层级状态"""
+        # 先归位上一轮下单/撤单变化的层级，再批量查询挂有未完成订单的层级
+        self._refresh_dirty_levels()
+        await self.update_all_order_status()
+
+        self._refresh_dirty_levels()
 
         # 处理完成的层级
-        completed = self.levels_by_state[GridLevelStates.COMPLETE]
+        completed = list(self.levels_by_state[GridLevelStates.COMPLETE])
         for level in completed:
             if (level.active_open_order and level.active_open_order.is_filled and
                 level.active_close_order and level.active_close_order.is_filled):
@@ -391,7 +527,7 @@ class GridExecutor:
                 close_revenue = level.active_close_order.executed_amount_quote
                 fees = level.active_open_order.cum_fees_quote + level.active_close_order.cum_fees_quote
                 net_profit = close_revenue - open_cost - fees
-                profit_pct = (net_profit / open_cost * 100) if open_cost > 0 else Decimal("0")
+                profit_pct = (float(net_profit) / float(open_cost) * 100) if open_cost > 0 else 0.0
 
                 self.logger.info(f"网格层级 {level.id} 交易完成: "
                                f"开仓成本={open_cost:.4f}, 平仓收入={close_revenue:.4f}, "
@@ -402,12 +538,29 @@ class GridExecutor:
                 self._filled_orders.append(level.active_close_order)
 
                 # 重置层级以便复用
+                self._unindex_order(level.active_open_order)
+                self._unindex_order(level.active_close_order)
                 level.reset_level()
+                self._level_dirty.add(level)
 
                 self.logger.info(f"网格层级 {level.id} 已重置，可重新使用")
 
         # 处理失败的订单
         self._handle_failed_orders()
+        self._refresh_dirty_levels()
+
+    def _refresh_dirty_levels(self):
+        """重新计算有变化的层级状态，并同步状态集合和状态数组"""
+        while self._level_dirty:
+            level = self._level_dirty.pop()
+            level.update_state()
+            pos = self._level_pos[level.id]
+            new_code = _STATE_CODES[level.state]
+            old_code = int(self._states[pos])
+            if new_code != old_code:
+                self.levels_by_state[_STATES[old_code]].discard(level)
+                self.levels_by_state[level.state].add(level)
+                self._states[pos] = new_code
 
     def _handle_failed_orders(self):
         """处理失败或取消的订单"""
@@ -422,7 +575,9 @@ class GridExecutor:
                     self.logger.warning(f"层级 {level.id} 开仓订单失败: {level.active_open_order.order_id}, 状态: {order_status}")
 
                     # 重置开仓订单，使层级可以重新尝试
+                    self._unindex_order(level.active_open_order)
                     level.reset_open_order()
+                    self._level_dirty.add(level)
 
                 # 处理失败的平仓订单
                 if (level.active_close_order and
@@ -433,58 +588,46 @@ class GridExecutor:
                     self.logger.warning(f"层级 {level.id} 平仓订单失败: {level.active_close_order.order_id}, 状态: {order_status}")
 
                     # 重置平仓订单，使层级可以重新尝试止盈
+                    self._unindex_order(level.active_close_order)
                     level.reset_close_order()
+                    self._level_dirty.add(level)
 
         except Exception as e:
             self.logger.error(f"处理失败订单时出错: {e}")
 
-    def _update_order_status(self, tracked_order: TrackedOrder):
-        """更新订单状态"""
-        try:
-            # 查询交易所获取订单最新状态
-            order_status = self.connector.get_order_status(tracked_order.order_id)
-            if order_status:
-                # 更新订单状态
-                old_status = tracked_order.is_filled
-                success = tracked_order.update_from_exchange_data(order_status)
-
-                if success and not old_status and tracked_order.is_filled:
-                    # 订单从未成交变为已成交
-                    self.logger.info(f"订单 {tracked_order.order_id} 已成交: "
-                                   f"数量={tracked_order.executed_amount_base}, "
-                                   f"金额={tracked_order.executed_amount_quote}")
-
-        except Exception as e:
-            self.logger.error(f"更新订单状态失败: {e}")
-
-    def update_all_order_status(self):
+    async def update_all_order_status(self):
         """批量更新所有活跃订单状态"""
         try:
-            # 收集所有需要更新的订单ID
-            order_ids = []
-            order_map = {}
-
-            for level in self.grid_levels:
-                if level.active_open_order and not level.active_open_order.is_done:
-                    order_ids.append(level.active_open_order.order_id)
-                    order_map[level.active_open_order.order_id] = level.active_open_order
-
-                if level.active_close_order and not level.active_close_order.is_done:
-                    order_ids.append(level.active_close_order.order_id)
-                    order_map[level.active_close_order.order_id] = level.active_close_order
+            # 只有挂单状态的层级才有未完成订单，没有则直接返回
+            open_placed = self.levels_by_state[GridLevelStates.OPEN_ORDER_PLACED]
+            close_placed = self.levels_by_state[GridLevelStates.CLOSE_ORDER_PLACED]
+            if not open_placed and not close_placed:
+                return
 
-            if not order_ids:
+            order_map = {}
+            for level in open_placed:
+                order = level.active_open_order
+                if order and not order.is_done:
+                    order_map[order.order_id] = (level, order)
+            for level in close_placed:
+                order = level.active_close_order
+                if order and not order.is_done:
+                    order_map[order.order_id] = (level, order)
+
+            if not order_map:
                 return
 
-            # 批量查询订单状态
-            order_statuses = self.connector.get_multiple_order_status(order_ids)
+            # 批量查询订单状态（直接传入键视图，不另建ID列表）
+            order_statuses = await self.connector.get_multiple_order_status_async(order_map.keys())
 
             # 更新订单状态
             for order_id, order_data in order_statuses.items():
                 if order_data and order_id in order_map:
-                    tracked_order = order_map[order_id]
+                    level, tracked_order = order_map[order_id]
                     old_status = tracked_order.is_filled
-                    success = tracked_order.update_from_exchange_data(order_data)
+                    success = tracked_order.update_from_exchange_data(order_data) is OrderUpdateResult.UPDATED
+                    if success:
+                        self._level_dirty.add(level)
 
                     if success and not old_status and tracked_order.is_filled:
                         self.logger.info(f"订单 {order_id} 已成交: "
@@ -494,16 +637,20 @@ class GridExecutor:
         except Exception as e:
             self.logger.error(f"批量更新订单状态失败: {e}")
 
-    def update_basic_metrics(self):
+    async def update_basic_metrics(self):
         """更新基础指标"""
         try:
-            # 更新持仓信息
-            long_pos, short_pos = self.connector.get_positions()
+            # 首次通过REST初始化持仓，之后只在用户数据流推送了新持仓时读取缓存
+            if self._seen_position_version < 0:
+                await self.connector.get_positions_async()
+            elif self._seen_position_version == self.connector.position_version:
+                return
 
+            self._seen_position_version = self.connector.position_version
             if self.config.side == TradeType.BUY:
-                self.position_size_base = long_pos
+                self.position_size_base = self.connector.long_position
             else:
-                self.position_size_base = short_pos
+                self.position_size_base = self.connector.short_position
 
         except Exception as e:
             self.logger.error(f"更新基础指标时出错: {e}")
@@ -519,40 +666,36 @@ class GridExecutor:
         n_open_orders = len(self.levels_by_state[GridLevelStates.OPEN_ORDER_PLACED])
 
         # 检查订单频率限制
-        current_time = time.time()
+        current_time = self._loop.time()
         if (self.max_open_creation_timestamp > current_time - self.config.order_frequency or
                 n_open_orders >= self.config.max_open_orders):
             return []
 
-        # 过滤激活边界内的层级
+        # 过滤激活边界内的层级，并按接近中间价排序（层级下标）
         levels_allowed = self._filter_levels_by_activation_bounds()
 
-        # 按接近中间价排序
-        sorted_levels_by_proximity = self._sort_levels_by_proximity(levels_allowed)
-
         # 返回可以创建的层级（限制数量）
         max_new_orders = self.config.max_open_orders - n_open_orders
-        return sorted_levels_by_proximity[:max_new_orders]
+        return [self.grid_levels[i] for i in levels_allowed[:max_new_orders]]
 
     def get_close_orders_to_create(self) -> List[GridLevel]:
         """获取需要创建平仓订单的网格层级 - 完全参考Hummingbot逻辑"""
         close_orders_proposal = []
         open_orders_filled = self.levels_by_state[GridLevelStates.OPEN_ORDER_FILLED]
 
+        lo, hi = self._bounds_lo, self._bounds_hi
+
         for level in open_orders_filled:
             if self.config.activation_bounds:
-                # 计算止盈价格到中间价的距离
-                take_profit_price = self._get_take_profit_price(level)
-                mid_price = self.connector.get_mid_price()
-                tp_to_mid = abs(take_profit_price - mid_price) / mid_price
-
-                if tp_to_mid < self.config.activation_bounds:
+                # 止盈价格落在激活区间内才创建止盈单
+                take_profit_price = self._get_take_profit_price_f(level)
+                if lo < take_profit_price < hi:
                     close_orders_proposal.append(level)
             else:
                 close_orders_proposal.append(level)
 
         if close_orders_proposal:
-            self.logger.debug(f"发现 {len(close_orders_proposal)} 个层级需要创建止盈订单")
+            self.logger.debug("发现 %d 个层级需要创建止盈订单", len(close_orders_proposal))
 
         return close_orders_proposal
 
@@ -563,15 +706,17 @@ class GridExecutor:
             open_orders_placed = [level.active_open_order for level in
                                 self.levels_by_state[GridLevelStates.OPEN_ORDER_PLACED]]
 
-            mid_price = self.connector.get_mid_price()
+            lo, hi = self._bounds_lo, self._bounds_hi
+            debug = self.logger.isEnabledFor(logging.DEBUG)
 
             for order in open_orders_placed:
-                if order and order.price:
-                    # 计算订单价格与中间价的距离百分比
-                    distance_pct = abs(order.price - mid_price) / mid_price
-                    if distance_pct > self.config.activation_bounds:
+                if order and order.price_f:
+                    # 订单价格超出激活区间则取消
+                    if order.price_f < lo or order.price_f > hi:
                         open_orders_to_cancel.append(order.order_id)
-                        self.logger.debug(f"取消开仓订单 {order.order_id}: 距离={distance_pct:.3f} > 边界={self.config.activation_bounds:.3f}")
+                        if debug:
+                            self.logger.debug("取消开仓订单 %s: 价格=%.5f 超出区间 [%.5f, %.5f]",
+                                              order.order_id, order.price_f, lo, hi)
 
             return open_orders_to_cancel
 
@@ -584,15 +729,17 @@ class GridExecutor:
             close_orders_placed = [level.active_close_order for level in
                                  self.levels_by_state[GridLevelStates.CLOSE_ORDER_PLACED]]
 
-            mid_price = self.connector.get_mid_price()
+            lo, hi = self._bounds_lo, self._bounds_hi
+            debug = self.logger.isEnabledFor(logging.DEBUG)
 
             for order in close_orders_placed:
-                if order and order.price:
-                    # 计算订单价格与中间价的距离百分比
-                    distance_to_mid = abs(order.price - mid_price) / mid_price
-                    if distance_to_mid > self.config.activation_bounds:
+                if order and order.price_f:
+                    # 订单价格超出激活区间则取消
+                    if order.price_f < lo or order.price_f > hi:
                         close_orders_to_cancel.append(order.order_id)
-                        self.logger.debug(f"取消平仓订单 {order.order_id}: 距离={distance_to_mid:.3f} > 边界={self.config.activation_bounds:.3f}")
+                        if debug:
+                            self.logger.debug("取消平仓订单 %s: 价格=%.5f 超出区间 [%.5f, %.5f]",
+                                              order.order_id, order.price_f, lo, hi)
 
             return close_orders_to_cancel
 
@@ -600,45 +747,40 @@ class GridExecutor:
 
 
 
-    def _filter_levels_by_activation_bounds(self) -> List[GridLevel]:
-        """根据激活边界过滤层级 - 完全参考Hummingbot逻辑"""
-        not_active_levels = self.levels_by_state[GridLevelStates.NOT_ACTIVE]
+    def _filter_levels_by_activation_bounds(self) -> np.ndarray:
+        """
+        根据激活边界过滤未激活层级 - 完全参考Hummingbot逻辑
+        返回按接近中间价排序的层级下标
+        """
+        mid_price = self._tick_mid_price_f
+        lo, hi = -np.inf, np.inf
 
         if self.config.activation_bounds:
-            mid_price = self.connector.get_mid_price()
             if self.config.side == TradeType.BUY:
                 # 多头网格：价格高于下边界的层级可以激活
-                activation_bounds_price = mid_price * (1 - self.config.activation_bounds)
-                filtered_levels = [level for level in not_active_levels if level.price >= activation_bounds_price]
-                self.logger.debug(f"多头网格激活边界: 中间价={mid_price:.5f}, 下边界={activation_bounds_price:.5f}, 过滤后层级数={len(filtered_levels)}")
+                lo = self._bounds_lo
+                self.logger.debug("多头网格激活边界: 中间价=%.5f, 下边界=%.5f", mid_price, lo)
             else:
                 # 空头网格：价格低于上边界的层级可以激活
-                activation_bounds_price = mid_price * (1 + self.config.activation_bounds)
-                filtered_levels = [level for level in not_active_levels if level.price <= activation_bounds_price]
-                self.logger.debug(f"空头网格激活边界: 中间价={mid_price:.5f}, 上边界={activation_bounds_price:.5f}, 过滤后层级数={len(filtered_levels)}")
-
-            return filtered_levels
+                hi = self._bounds_hi
+                self.logger.debug("空头网格激活边界: 中间价=%.5f, 上边界=%.5f", mid_price, hi)
 
-        return not_active_levels
+        return _activation_candidates(self._prices_f, self._states, _NOT_ACTIVE_CODE, lo, hi, mid_price)
 
     def _get_take_profit_price(self, level: GridLevel) -> Decimal:
         """计算止盈价格 - 参考Hummingbot逻辑"""
         if not level.active_open_order:
             return Decimal("0")
 
-        open_price = level.active_open_order.price
+        # 多头止盈价高于开仓价，空头止盈价低于开仓价
+        return level.active_open_order.price * self._tp_factor
 
-        if self.config.side == TradeType.BUY:
-            # 多头止盈：卖出价格高于开仓价格
-            return open_price * (1 + level.take_profit_pct)
-        else:
-            # 空头止盈：买入价格低于开仓价格
-            return open_price * (1 - level.take_profit_pct)
+    def _get_take_profit_price_f(self, level: GridLevel) -> float:
+        """浮点版止盈价格，仅用于与中间价的距离比较"""
+        if not level.active_open_order:
+            return 0.0
 
-    def _sort_levels_by_proximity(self, levels: List[GridLevel]) -> List[GridLevel]:
-        """按接近中间价排序层级"""
-        current_price = self.connector.get_mid_price()
-        return sorted(levels, key=lambda level: abs(level.price - current_price))
+        return level.active_open_order.price_f * self._tp_factor_f
 
 
 
@@ -659,7 +801,7 @@ class GridExecutor:
             )
 
             # 下单
-            order_result = self.connector.place_order(order_candidate)
+            order_result = await self.connector.place_order_async(order_candidate)
 
             if order_result:
                 # 创建追踪订单
@@ -675,9 +817,11 @@ class GridExecutor:
                 # 更新层级状态
                 level.active_open_order = tracked_order
                 level.state = GridLevelStates.OPEN_ORDER_PLACED
+                self._order_index[tracked_order.order_id] = (level, "open")
+                self._level_dirty.add(level)
 
                 # 更新时间戳
-                self.max_open_creation_timestamp = time.time()
+                self.max_open_creation_timestamp = self._loop.time()
 
                 self.logger.info(f"层级 {level.id} 开仓订单已下达: {order_result['id']}")
             else:
@@ -690,14 +834,15 @@ class GridExecutor:
         """调整并下达平仓订单（止盈单）- 完全参考Hummingbot逻辑"""
         try:
             if not level.active_open_order or not level.active_open_order.is_filled:
-                self.logger.debug(f"层级 {level.id} 开仓订单未成交，跳过平仓订单创建")
+                self.logger.debug("层级 %s 开仓订单未成交，跳过平仓订单创建", level.id)
                 return
 
             # 如果已有平仓订单，先取消旧订单（参考Hummingbot逻辑）
             if level.active_close_order:
-                self.logger.debug(f"层级 {level.id} 已有平仓订单 {level.active_close_order.order_id}，先取消")
+                self.logger.debug("层级 %s 已有平仓订单 %s，先取消", level.id, level.active_close_order.order_id)
                 try:
                     await self.cancel_order(level.active_close_order.order_id)
+                    self._unindex_order(level.active_close_order)
                     level.active_close_order = None
                 except Exception as e:
                     self.logger.warning(f"取消旧平仓订单失败: {e}")
@@ -709,25 +854,25 @@ class GridExecutor:
             # 计算止盈价格
             if self.config.side == TradeType.BUY:
                 # 多头止盈：卖出价格高于开仓价格
-                base_close_price = level.active_open_order.price * (1 + level.take_profit_pct)
+                base_close_price = level.active_open_order.price * self._tp_factor
                 close_side = TradeType.SELL
 
                 # 应用安全价差，确保不会立即成交
                 if base_close_price <= current_price:
-                    close_price = current_price * (1 + self.config.safe_extra_spread)
-                    self.logger.debug(f"调整多头止盈价格: {base_close_price:.5f} -> {close_price:.5f}")
+                    close_price = current_price * self._safe_spread_factor
+                    self.logger.debug("调整多头止盈价格: %.5f -> %.5f", base_close_price, close_price)
                 else:
                     close_price = base_close_price
 
             else:
                 # 空头止盈：买入价格低于开仓价格
-                base_close_price = level.active_open_order.price * (1 - level.take_profit_pct)
+                base_close_price = level.active_open_order.price * self._tp_factor
                 close_side = TradeType.BUY
 
                 # 应用安全价差，确保不会立即成交
                 if base_close_price >= current_price:
-                    close_price = current_price * (1 - self.config.safe_extra_spread)
-                    self.logger.debug(f"调整空头止盈价格: {base_close_price:.5f} -> {close_price:.5f}")
+                    close_price = current_price * self._safe_spread_factor
+                    self.logger.debug("调整空头止盈价格: %.5f -> %.5f", base_close_price, close_price)
                 else:
                     close_price = base_close_price
 
@@ -739,7 +884,7 @@ class GridExecutor:
                 # 简化处理：如果有手续费，稍微减少平仓数量
                 fee_adjustment = close_amount * Decimal("0.001")  # 0.1%的调整
                 close_amount = close_amount - fee_adjustment
-                self.logger.debug(f"调整平仓数量以考虑手续费: -{fee_adjustment:.8f}")
+                self.logger.debug("调整平仓数量以考虑手续费: -%.8f", fee_adjustment)
 
             # 量化价格和数量
             close_price = self.connector._quantize_price(close_price)
@@ -761,7 +906,7 @@ class GridExecutor:
             )
 
             # 下单
-            order_result = self.connector.place_order(order_candidate)
+            order_result = await self.connector.place_order_async(order_candidate)
 
             if order_result:
                 # 创建追踪订单
@@ -777,6 +922,8 @@ class GridExecutor:
                 # 更新层级状态
                 level.active_close_order = tracked_order
                 level.state = GridLevelStates.CLOSE_ORDER_PLACED
+                self._order_index[tracked_order.order_id] = (level, "close")
+                self._level_dirty.add(level)
 
                 self.logger.info(f"层级 {level.id} 止盈订单已下达: {order_result['id']}, "
                                f"价格={close_price:.5f}, 数量={close_amount:.8f}, "
@@ -790,35 +937,63 @@ class GridExecutor:
     async def cancel_order(self, order_id: str):
         """取消订单"""
         try:
-            success = self.connector.cancel_order(order_id)
+            success = await self.connector.cancel_order_async(order_id)
             if success:
-                # 找到对应的层级并更新状态
-                for level in self.grid_levels:
-                    if (level.active_open_order and level.active_open_order.order_id == order_id):
-                        level.reset_open_order()
-                        self.logger.info(f"层级 {level.id} 的开仓订单 {order_id} 已取消")
-                        break
-                    elif (level.active_close_order and level.active_close_order.order_id == order_id):
-                        level.reset_close_order()
-                        self.logger.info(f"层级 {level.id} 的平仓订单 {order_id} 已取消")
-                        break
+                self._reset_cancelled_order(order_id)
             else:
                 self.logger.error(f"取消订单 {order_id} 失败")
 
         except Exception as e:
             self.logger.error(f"取消订单 {order_id} 时出错: {e}")
 
+    async def cancel_orders(self, order_ids: List[str]):
+        """取消多个订单：数量较多时按BATCH_CANCEL_LIMIT分组走批量撤单接口"""
+        if len(order_ids) < BATCH_CANCEL_THRESHOLD:
+            await asyncio.gather(*(self._bounded(self.cancel_order(order_id)) for order_id in order_ids))
+            return
+
+        chunks = [order_ids[i:i + BATCH_CANCEL_LIMIT] for i in range(0, len(order_ids), BATCH_CANCEL_LIMIT)]
+        await asyncio.gather(*(self._bounded(self._cancel_orders_chunk(chunk)) for chunk in chunks))
+
+    async def _cancel_orders_chunk(self, order_ids: List[str]):
+        """批量撤销一组订单，并重置撤销成功的层级"""
+        for order_id in await self.connector.cancel_orders_batch_async(order_ids):
+            self._reset_cancelled_order(order_id)
+
+    def _reset_cancelled_order(self, order_id: str):
+        """订单撤销成功后重置对应层级"""
+        level, side = self._order_index.pop(order_id, (None, None))
+        if level is None:
+            return
+
+        if side == "open":
+            level.reset_open_order()
+            self.logger.info(f"层级 {level.id} 的开仓订单 {order_id} 已取消")
+        else:
+            level.reset_close_order()
+            self.logger.info(f"层级 {level.id} 的平仓订单 {order_id} 已取消")
+        self._level_dirty.add(level)
+
+    def _unindex_order(self, order: Optional[TrackedOrder]):
+        """层级释放订单时同步移除订单索引"""
+        if order and order.order_id:
+            self._order_index.pop(order.order_id, None)
+
     async def cancel_open_orders(self):
         """取消所有开仓订单"""
         try:
-            success = self.connector.cancel_all_orders()
+            success = await self.connector.cancel_all_orders_async()
             if success:
                 # 重置所有层级的订单状态
                 for level in self.grid_levels:
                     if level.active_open_order and not level.active_open_order.is_filled:
+                        self._unindex_order(level.active_open_order)
                         level.reset_open_order()
+                        self._level_dirty.add(level)
                     if level.active_close_order and not level.active_close_order.is_filled:
+                        self._unindex_order(level.active_close_order)
                         level.reset_close_order()
+                        self._level_dirty.add(level)
 
                 self.logger.info("所有开仓订单已取消")
             else:
@@ -830,7 +1005,7 @@ class GridExecutor:
     async def close_open_positions(self):
         """平掉所有开仓"""
         try:
-            success = self.connector.close_all_positions()
+            success = await self.connector.close_all_positions_async()
             if success:
                 self.logger.info("所有持仓已平仓")
             else:
@@ -847,50 +1022,35 @@ class GridExecutor:
         """启动网格执行器"""
         try:
             self.logger.info("正在启动网格执行器...")
+            self._loop = asyncio.get_running_loop()
 
             # 余额验证已在StrategyController层面完成，这里跳过
             # await self.validate_sufficient_balance()
 
             # 设置状态为运行中
-            self._status = RunnableStatus.RUNNING
+            self._set_status(RunnableStatus.RUNNING)
 
-            # 启动控制任务 - 使用完整版本的control_task
-            self.control_task_handle = asyncio.create_task(self._main_control_loop())
+            # 控制循环由StrategyController._run_executor_loop驱动，这里不再另建任务：
+            # 下单是异步的，两个循环并发调用control_task会在同一层级重复挂单
 
             self.logger.info("网格执行器启动成功")
 
         except Exception as e:
             self.logger.error(f"启动网格执行器时出错: {e}")
-            self._status = RunnableStatus.TERMINATED
+            self._set_status(RunnableStatus.TERMINATED)
             raise
 
-    async def _main_control_loop(self):
-        """主控制循环 - 定期调用完整版本的control_task"""
-        try:
-            while self._status == RunnableStatus.RUNNING:
-                await self.control_task()
-                await asyncio.sleep(1)  # 每秒执行一次控制逻辑
-        except Exception as e:
-            self.logger.error(f"主控制循环异常: {e}")
-            self._status = RunnableStatus.TERMINATED
-
-
-
     async def stop(self):
         """停止网格执行器"""
         try:
             self.logger.info("正在停止网格执行器...")
 
             # 设置状态为关闭中
-            self._status = RunnableStatus.SHUTTING_DOWN
+            self._set_status(RunnableStatus.SHUTTING_DOWN)
 
-            # 停止控制任务
-            if hasattr(self, 'control_task_handle') and self.control_task_handle:
-                self.control_task_handle.cancel()
-                try:
-                    await self.control_task_handle
-                except asyncio.CancelledError:
-                    pass
+            # 等待已发出的下单/撤单完成并记录，再统一撤单
+            if self._inflight_orders:
+                await asyncio.gather(*self._inflight_orders, return_exceptions=True)
 
             # 取消所有订单
             await self.cancel_open_orders()
@@ -899,20 +1059,20 @@ class GridExecutor:
             await self.close_open_positions()
 
             # 设置状态为已终止
-            self._status = RunnableStatus.TERMINATED
+            self._set_status(RunnableStatus.TERMINATED)
 
             self.logger.info("网格执行器停止成功")
 
         except Exception as e:
             self.logger.error(f"停止网格执行器时出错: {e}")
-            self._status = RunnableStatus.TERMINATED
+            self._set_status(RunnableStatus.TERMINATED)
             raise
 
     async def validate_sufficient_balance(self):
         """验证余额是否充足"""
         try:
             # 获取账户余额
-            balance = self.connector.get_balance()
+            balance = await self.connector.get_balance_async()
             available_balance = balance["free"]
 
             # 检查余额是否足够
@@ -928,21 +1088,17 @@ class GridExecutor:
             self.logger.error(f"余额验证失败: {e}")
             raise
 
-    def get_status_info(self) -> Dict[str, Any]:
-        """获取执行器状态信息"""
-        return {
-            "id": self.config.id,
-            "side": self.config.side.value,
-            "status": self._status.value,
-            "close_type": self.close_type.value if self.close_type else None,
-            "grid_levels": len(self.grid_levels),
-            "levels_by_state": {
-                state.value: len(levels) for state, levels in self.levels_by_state.items()
-            },
-            "position_size_base": float(self.position_size_base),
-            "current_retries": self._current_retries,
-            "max_retries": self.max_retries,
-        }
+    def get_status_info(self) -> Mapping[str, Any]:
+        """获取执行器状态信息（只读视图，每次调用原地刷新，需要快照时请复制，levels_by_state也需复制）"""
+        # 状态信息只在进程内读取和记录日志，不做JSON序列化；
+        # 如需对外输出，先dict()复制再用orjson编码（值均为str/int/float，可直接编码）
+        for state, levels in self.levels_by_state.items():
+            self._state_counts[state.value] = len(levels)
+
+        info = self._status_info
+        info["position_size_base"] = float(self.position_size_base)
+        info["current_retries"] = self._current_retries
+        return self._status_info_view
 
     def is_healthy(self) -> bool:
         """检查执行器是否健康"""
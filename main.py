@@ -10,7 +10,13 @@ import sys
 import time
 from typing import Optional
 
+try:
+    import uvloop
+except ImportError:  # uvloop未安装时使用默认事件循环
+    uvloop = None
+
 from strategy_controller import StrategyController
+from manual_cleanup import manual_cleanup
 from utils.logger import setup_logging, get_main_logger
 from config import validate_config
 
@@ -18,6 +24,21 @@ from config import validate_config
 logger = get_main_logger()
 
 
+async def _cancel_and_wait(task: Optional[asyncio.Task]):
+    """取消任务并等待其真正结束，释放任务持有的协程帧"""
+    if task is None or task.done():
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        # 当前任务自身也被取消时继续向上传递
+        if asyncio.current_task().cancelling():
+            raise
+    except Exception as e:
+        logger.error(f"任务取消时抛出异常: {e}")
+
+
 class DualGridBot:
     """双账户对冲网格策略机器人主类"""
     
@@ -33,24 +54,46 @@ class DualGridBot:
         # 运行状态
         self.is_running = False
         self.stop_signal = False
+        self._stop_event: Optional[asyncio.Event] = None  # 在run中创建，收到停止信号时置位
         self.cleanup_completed = False
         
         self.logger.info("DualGridBot initialized")
     
-    def setup_signal_handlers(self):
-        """设置信号处理器"""
+    def _request_stop(self, signum):
+        """在事件循环中处理停止信号"""
+        self.logger.info(f"收到停止信号 {signum}，开始优雅停止...")
+        self.stop_signal = True
+        # 通知策略控制器停止
+        if self.controller:
+            self.controller.cancel_event.set()
+        if self._stop_event:
+            self._stop_event.set()
+
+    def _on_strategy_task_done(self, task: asyncio.Task):
+        """策略启动失败时触发停止，正常完成启动不影响运行"""
+        if task.cancelled() or task.exception() is None:
+            return
+        self.logger.error(f"策略任务异常结束: {task.exception()}")
+        if self._stop_event:
+            self._stop_event.set()
+
+    def setup_signal_handlers(self, loop: asyncio.AbstractEventLoop):
+        """设置信号处理器：POSIX上由事件循环线程回调处理，Windows回退到signal.signal"""
+
         def signal_handler(signum, frame):
-            self.logger.info(f"收到停止信号 {signum}，开始优雅停止...")
-            self.stop_signal = True
-            # 通知策略控制器停止
-            if self.controller:
-                self.controller.stop_signal = True
+            # 信号可能在任意字节码处打断主线程，只把停止请求投递回事件循环
+            loop.call_soon_threadsafe(self._request_stop, signum)
 
         # 注册信号处理器
-        signal.signal(signal.SIGINT, signal_handler)   # Ctrl+C
-        signal.signal(signal.SIGTERM, signal_handler)  # 终止信号
+        signals = [signal.SIGINT, signal.SIGTERM]  # Ctrl+C / 终止信号
         if hasattr(signal, 'SIGBREAK'):  # Windows
-            signal.signal(signal.SIGBREAK, signal_handler)
+            signals.append(signal.SIGBREAK)
+        for sig in signals:
+            try:
+                loop.add_signal_handler(sig, self._request_stop, sig)
+            except (NotImplementedError, RuntimeError):
+                # Windows事件循环不支持add_signal_handler
+                signal.signal(sig, signal_handler)
     
     async def startup_cleanup(self):
         """启动时清理账户"""
@@ -59,19 +102,16 @@ class DualGridBot:
         self.logger.info("=" * 60)
 
         try:
-            # 导入手动清理功能
-            from manual_cleanup import manual_cleanup
-
-            # 执行清理
-            cleanup_success = await manual_cleanup()
+            # 复用策略控制器的连接器执行清理，避免重复建立连接和加载市场数据
+            await self.controller.initialize_connectors()
+            cleanup_success = await manual_cleanup(self.controller.connector_a, self.controller.connector_b)
 
             if cleanup_success:
                 self.logger.info("✅ 启动前账户清理成功")
             else:
                 self.logger.warning("⚠️ 启动前账户清理不完整，但继续运行")
 
-            # 等待一段时间确保清理完成
-            await asyncio.sleep(3)
+            # manual_cleanup已轮询等待账户清空并完成验证，这里无需再固定等待
 
         except Exception as e:
             self.logger.error(f"❌ 启动前账户清理失败: {e}")
@@ -102,7 +142,8 @@ class DualGridBot:
     async def run(self):
         """启动机器人"""
         # 设置信号处理器
-        self.setup_signal_handlers()
+        self._stop_event = asyncio.Event()
+        self.setup_signal_handlers(asyncio.get_running_loop())
         
         # 验证配置
         self.logger.info("Validating configuration...")
@@ -120,36 +161,34 @@ class DualGridBot:
         self.logger.info("🚀 双账户对冲网格策略正式启动")
         self.logger.info("=" * 60)
         
+        strategy_task = None
         try:
-            # 启动策略控制器
+            # 启动策略控制器（start完成初始化后即返回，策略在后台任务中运行）
             strategy_task = asyncio.create_task(self.controller.start())
+            strategy_task.add_done_callback(self._on_strategy_task_done)
             
             self.is_running = True
             
-            # 监控停止信号
-            while not self.stop_signal and self.is_running:
-                await asyncio.sleep(1)
-            
+            # 等待停止信号，期间不占用事件循环；
+            # 需要周期性健康检查时应单独建任务，不要在这里加轮询
+            await self._stop_event.wait()
+
             # 收到停止信号，优雅关闭
             self.logger.info("收到停止信号，正在优雅关闭...")
             
             # 停止策略控制器
             if self.controller:
                 await self.controller.stop()
-            
-            # 取消任务
-            strategy_task.cancel()
-            
-            try:
-                await asyncio.gather(strategy_task, return_exceptions=True)
-            except asyncio.CancelledError:
-                self.logger.info("所有任务已取消")
                 
         except Exception as e:
             if not self.stop_signal:
                 self.logger.error(f"策略运行异常: {e}")
                 raise
         finally:
+            # 无论以何种方式退出，都取消并等待启动任务结束
+            await _cancel_and_wait(strategy_task)
+            self.logger.info("所有任务已取消")
+
             # 确保优雅停止
             await self.graceful_shutdown()
 
@@ -179,8 +218,8 @@ async def main():
 
 if __name__ == "__main__":
     # 检查Python版本
-    if sys.version_info < (3, 8):
-        print("Error: Python 3.8 or higher is required")
+    if sys.version_info < (3, 11):
+        print("Error: Python 3.11 or higher is required")
         sys.exit(1)
     
     # 显示启动信息
@@ -191,9 +230,13 @@ if __name__ == "__main__":
     print("=" * 60)
     print()
     
-    # 运行机器人
+    # 使用libuv事件循环，降低WebSocket与REST协程切换开销
+    loop_factory = uvloop.new_event_loop if uvloop is not None else None
+
+    # 运行机器人（信号在事件循环内处理，见setup_signal_handlers）
     try:
-        asyncio.run(main())
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(main())
     except KeyboardInterrupt:
         print("\nProgram interrupted by user")
     except Exception as e:
@@ -5,13 +5,39 @@
 
 import asyncio
 import time
+from decimal import Decimal
+from typing import Optional
+
+try:
+    import uvloop
+except ImportError:  # uvloop未安装时使用默认事件循环
+    uvloop = None
+
 from binance_connector import BinanceConnector
 from config import get_account_config, ALL_CONFIG
 from utils.logger import setup_logging, get_main_logger
 
+FLAT_WAIT_TIMEOUT = 3.0  # 等待账户清空的最长时间（秒）
+FLAT_POLL_INTERVAL = 0.2  # 轮询间隔（秒）
+
+
+async def _wait_flat(connector: BinanceConnector, timeout: float = FLAT_WAIT_TIMEOUT,
+                     interval: float = FLAT_POLL_INTERVAL) -> bool:
+    """轮询直到账户无挂单且无持仓，超时返回False"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        orders, long_pos, short_pos = await connector.snapshot()
+        if not orders and long_pos == 0 and short_pos == 0:
+            return True
+        if loop.time() + interval > deadline:
+            return False
+        await asyncio.sleep(interval)
+
 
-async def manual_cleanup():
-    """手动清理两个账户"""
+async def manual_cleanup(connector_a: Optional[BinanceConnector] = None,
+                         connector_b: Optional[BinanceConnector] = None):
+    """手动清理两个账户；传入已有连接器时直接复用，否则新建"""
     
     # 设置日志
     setup_logging()
@@ -21,69 +47,82 @@ async def manual_cleanup():
     logger.info("  手动清理脚本启动")
     logger.info("=" * 80)
     
+    owned_connectors = []  # 本函数自建的连接器，结束时关闭
     try:
         # 获取配置
         trading_config = ALL_CONFIG["trading"]
-        account_a_config = get_account_config("A")
-        account_b_config = get_account_config("B")
-        
-        # 创建连接器
-        logger.info("创建连接器...")
-        
-        connector_a = BinanceConnector(
-            api_key=account_a_config["api_key"],
-            api_secret=account_a_config["api_secret"],
-            trading_pair=trading_config["pair"],
-            contract_type=trading_config["contract_type"],
-            leverage=trading_config["leverage"],
-            account_name="Account_A_Manual_Cleanup"
-        )
-        
-        connector_b = BinanceConnector(
-            api_key=account_b_config["api_key"],
-            api_secret=account_b_config["api_secret"],
-            trading_pair=trading_config["pair"],
-            contract_type=trading_config["contract_type"],
-            leverage=trading_config["leverage"],
-            account_name="Account_B_Manual_Cleanup"
-        )
-        
-        # 检查当前状态
+        
+        # 创建连接器（未传入时）
+        if connector_a is None:
+            logger.info("创建账户A连接器...")
+            account_a_config = get_account_config("A")
+            connector_a = BinanceConnector(
+                api_key=account_a_config["api_key"],
+                api_secret=account_a_config["api_secret"],
+                trading_pair=trading_config["pair"],
+                contract_type=trading_config["contract_type"],
+                leverage=trading_config["leverage"],
+                account_name="Account_A_Manual_Cleanup"
+            )
+            owned_connectors.append(connector_a)
+        
+        if connector_b is None:
+            logger.info("创建账户B连接器...")
+            account_b_config = get_account_config("B")
+            connector_b = BinanceConnector(
+                api_key=account_b_config["api_key"],
+                api_secret=account_b_config["api_secret"],
+                trading_pair=trading_config["pair"],
+                contract_type=trading_config["contract_type"],
+                leverage=trading_config["leverage"],
+                account_name="Account_B_Manual_Cleanup"
+            )
+            owned_connectors.append(connector_b)
+        
+        # 清理前状态检查只用于日志，与清理并发进行，不占用关键路径；
+        # 先让出一次事件循环，使快照请求先于清理请求发出（结果仍可能包含清理开始后的状态，仅供参考）
+        pre_check = asyncio.gather(connector_a.snapshot(), connector_b.snapshot())
+        await asyncio.sleep(0)
+
+        # 开始清理
         logger.info("\n" + "=" * 50)
-        logger.info("  清理前状态检查")
+        logger.info("  开始清理")
         logger.info("=" * 50)
         
+        # 并行清理两个账户（cleanup本身是协程，阻塞REST调用已在连接器线程池中执行，无需再包to_thread）
+        cleanup_tasks = [
+            connector_a.cleanup(),
+            connector_b.cleanup()
+        ]
+        
+        logger.info("执行并行清理...")
+        results = await asyncio.gather(*cleanup_tasks, return_exceptions=True)
+        
+        # 检查当前状态（查询在清理发起时已同时发出）
+        logger.info("\n" + "=" * 50)
+        logger.info("  清理前状态检查（与清理同时查询，仅供参考）")
+        logger.info("=" * 50)
+        
+        try:
+            (orders_a, long_pos_a, short_pos_a), (orders_b, long_pos_b, short_pos_b) = await pre_check
+        except Exception as e:
+            # 清理是幂等的，清理前状态查询失败不影响后续流程
+            logger.warning(f"清理前状态查询失败: {e}")
+            orders_a, long_pos_a, short_pos_a = [], Decimal("0"), Decimal("0")
+            orders_b, long_pos_b, short_pos_b = [], Decimal("0"), Decimal("0")
+
         # 账户A状态
         logger.info("账户A状态:")
-        orders_a = connector_a.get_open_orders()
-        long_pos_a, short_pos_a = connector_a.get_positions()
         logger.info(f"  挂单数量: {len(orders_a)}")
         logger.info(f"  多头持仓: {long_pos_a}")
         logger.info(f"  空头持仓: {short_pos_a}")
         
         # 账户B状态
         logger.info("账户B状态:")
-        orders_b = connector_b.get_open_orders()
-        long_pos_b, short_pos_b = connector_b.get_positions()
         logger.info(f"  挂单数量: {len(orders_b)}")
         logger.info(f"  多头持仓: {long_pos_b}")
         logger.info(f"  空头持仓: {short_pos_b}")
         
-        # 开始清理
-        logger.info("\n" + "=" * 50)
-        logger.info("  开始清理")
-        logger.info("=" * 50)
-        
-        # 并行清理两个账户
-        loop = asyncio.get_event_loop()
-        cleanup_tasks = [
-            loop.run_in_executor(None, connector_a.cleanup),
-            loop.run_in_executor(None, connector_b.cleanup)
-        ]
-        
-        logger.info("执行并行清理...")
-        results = await asyncio.gather(*cleanup_tasks, return_exceptions=True)
-        
         # 检查清理结果
         success_a = results[0] if not isinstance(results[0], Exception) else False
         success_b = results[1] if not isinstance(results[1], Exception) else False
@@ -98,27 +137,28 @@ async def manual_cleanup():
         else:
             logger.info(f"账户B清理结果: {'成功' if success_b else '失败'}")
         
-        # 等待一下
-        logger.info("等待3秒后验证清理结果...")
-        await asyncio.sleep(3)
+        # 等待两个账户清空（最多FLAT_WAIT_TIMEOUT秒），清空后立即继续
+        logger.info(f"等待账户清空（最多{FLAT_WAIT_TIMEOUT:.0f}秒）后验证清理结果...")
+        await asyncio.gather(_wait_flat(connector_a), _wait_flat(connector_b))
         
         # 验证清理结果
         logger.info("\n" + "=" * 50)
         logger.info("  清理后状态验证")
         logger.info("=" * 50)
         
+        (orders_a_after, long_pos_a_after, short_pos_a_after), \
+            (orders_b_after, long_pos_b_after, short_pos_b_after) = await asyncio.gather(
+                connector_a.snapshot(), connector_b.snapshot()
+            )
+
         # 账户A验证
         logger.info("账户A验证:")
-        orders_a_after = connector_a.get_open_orders()
-        long_pos_a_after, short_pos_a_after = connector_a.get_positions()
         logger.info(f"  挂单数量: {len(orders_a_after)} (清理前: {len(orders_a)})")
         logger.info(f"  多头持仓: {long_pos_a_after} (清理前: {long_pos_a})")
         logger.info(f"  空头持仓: {short_pos_a_after} (清理前: {short_pos_a})")
         
         # 账户B验证
         logger.info("账户B验证:")
-        orders_b_after = connector_b.get_open_orders()
-        long_pos_b_after, short_pos_b_after = connector_b.get_positions()
         logger.info(f"  挂单数量: {len(orders_b_after)} (清理前: {len(orders_b)})")
         logger.info(f"  多头持仓: {long_pos_b_after} (清理前: {long_pos_b})")
         logger.info(f"  空头持仓: {short_pos_b_after} (清理前: {short_pos_b})")
@@ -134,8 +174,9 @@ async def manual_cleanup():
         total_positions_before = abs(long_pos_a) + abs(short_pos_a) + abs(long_pos_b) + abs(short_pos_b)
         total_positions_after = abs(long_pos_a_after) + abs(short_pos_a_after) + abs(long_pos_b_after) + abs(short_pos_b_after)
         
-        logger.info(f"挂单清理: {total_orders_before} -> {total_orders_after}")
-        logger.info(f"持仓清理: {total_positions_before:.6f} -> {total_positions_after:.6f}")
+        # 清理前数据来自与清理并发的快照，可能偏小，最终是否成功只看清理后的数据
+        logger.info(f"挂单清理（清理前为参考值）: {total_orders_before} -> {total_orders_after}")
+        logger.info(f"持仓清理（清理前为参考值）: {total_positions_before:.6f} -> {total_positions_after:.6f}")
         
         if total_orders_after == 0 and total_positions_after == 0:
             logger.info("✅ 清理完全成功！")
@@ -153,9 +194,16 @@ async def manual_cleanup():
         logger.error(f"手动清理失败: {e}", exc_info=True)
         return False
 
+    finally:
+        for connector in owned_connectors:
+            await connector.close()
+
 
 def main():
     """主函数"""
+    if uvloop is not None:
+        uvloop.install()
+
     try:
         result = asyncio.run(manual_cleanup())
         if result:
@@ -1,23 +1,106 @@
 # dual_grid_bot/strategy_controller.py
 
 import asyncio
+import contextlib
 import logging
 import time
 from decimal import Decimal
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Final, Mapping, Optional, Tuple
 from datetime import datetime
 
-from config import ALL_CONFIG, get_account_config, validate_config
-from data_models import GridExecutorConfig, TradeType, OrderType
+from config import ALL_CONFIG, GRID_PARAMS, get_account_config, validate_config
+from data_models import GridExecutorConfig, OrderEvent, TradeType, OrderType
 from binance_connector import BinanceConnector
 from grid_executor import GridExecutor, RunnableStatus
 
+# 事件队列容量（满时由连接器丢弃最旧事件并插入GAP标记）
+EVENT_QUEUE_MAXSIZE = 4096
+
+# 策略状态缓存时间（秒），期间重复查询直接返回缓存，避免反复请求账户信息
+STRATEGY_STATUS_CACHE_TTL = 1.0
+
+# 余额计算使用的最小单位（1e-6 USDC），转成整数后比较和加减
+MICRO = 1_000_000
+MIN_TRANSFER_MICRO = 1 * MICRO  # 小于1 USDC的差异不转移
+
+
+def _to_micro(amount: Decimal) -> int:
+    """将金额转换为整数最小单位（向零截断）"""
+    return int(amount.scaleb(6))
+
+
+def _from_micro(amount: int) -> Decimal:
+    """将整数最小单位转换回Decimal，仅用于日志输出"""
+    return Decimal(amount).scaleb(-6)
+
+
+def _format_uptime(seconds: float) -> str:
+    """将运行秒数格式化为 H:MM:SS"""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}"
+
+
+def _snapshot_status_info(info: Mapping[str, Any]) -> Dict[str, Any]:
+    """复制执行器状态信息；levels_by_state是实时视图，需要一并复制"""
+    return {**info, "levels_by_state": dict(info["levels_by_state"])}
+
+
+def _check_nominal(available_a: int, available_b: int, leverage: int, required: int) -> Tuple[int, int, int, bool]:
+    """按整数最小单位计算两个账户的名义价值，返回 (A名义价值, B名义价值, 较小值, 是否满足要求)"""
+    nominal_a = available_a * leverage
+    nominal_b = available_b * leverage
+    min_nominal = nominal_a if nominal_a < nominal_b else nominal_b
+    return nominal_a, nominal_b, min_nominal, min_nominal >= required
+
+
+def _grid_config_template(executor_id: str, side: TradeType) -> GridExecutorConfig:
+    """按网格配置构建指定方向的执行器配置模板（时间戳在创建执行器时填入）"""
+    grid_config = ALL_CONFIG["grid"]
+    trading_config = ALL_CONFIG["trading"]
+    return GridExecutorConfig(
+        id=executor_id,
+        timestamp=0.0,
+        trading_pair=trading_config["pair"],
+        side=side,
+        start_price=grid_config["start_price"],
+        end_price=grid_config["end_price"],
+        total_amount_quote=grid_config["total_amount_quote"],
+        max_open_orders=grid_config["max_open_orders"],
+        min_spread_between_orders=grid_config["min_spread_between_orders"],
+        min_order_amount_quote=grid_config["min_order_amount_quote"],
+        order_type=OrderType.LIMIT,
+        order_frequency=grid_config["order_frequency"],
+        activation_bounds=grid_config["activation_bounds"],
+        safe_extra_spread=grid_config["safe_extra_spread"],
+        take_profit_pct=grid_config["take_profit_pct"],
+        leverage=trading_config["leverage"]
+    )
+
+
+# 配置只读，多空执行器配置在导入时构建并校验一次
+_LONG_GRID_CONFIG: Final[GridExecutorConfig] = _grid_config_template("long_grid", TradeType.BUY)
+_SHORT_GRID_CONFIG: Final[GridExecutorConfig] = _grid_config_template("short_grid", TradeType.SELL)
+
 
 class StrategyController:
     """
     策略控制器 - 双账户对冲网格策略的总指挥
     负责管理两个币安连接器和两个网格执行器的生命周期和同步
+    （事件循环由程序入口创建，已安装uvloop时使用uvloop，控制器内不再切换事件循环策略）
     """
+
+    # 属性固定，使用__slots__省去实例__dict__，监控和健康检查中的属性读取更快
+    __slots__ = (
+        "logger", "is_running", "start_time", "stop_time", "_start_monotonic",
+        "connector_a", "connector_b", "executor_long", "executor_short", "_connectors", "_executors",
+        "_connectors_ready",
+        "_event_queue", "_gap_sync_task", "monitor_task", "executor_tasks", "event_handler_task",
+        "_trading_cfg", "_grid_cfg", "_monitor_cfg", "_exchange_cfg",
+        "_event_driven_enabled", "_sync_interval", "_heartbeat_interval",
+        "boundary_stop_enabled", "boundary_check_interval",
+        "cancel_event", "_stop_task", "_status_cache", "_status_cache_time",
+    )
     
     def __init__(self):
         """初始化策略控制器"""
@@ -30,6 +113,7 @@ class StrategyController:
         # 状态管理
         self.is_running = False
         self.start_time: Optional[datetime] = None
+        self._start_monotonic: Optional[float] = None  # 启动时的单调时钟，用于计算运行时长
         self.stop_time: Optional[datetime] = None
         
         # 初始化连接器
@@ -39,20 +123,41 @@ class StrategyController:
         # 初始化执行器
         self.executor_long: Optional[GridExecutor] = None
         self.executor_short: Optional[GridExecutor] = None
+
+        # 已创建的连接器和执行器（按A/B、多/空顺序），批量操作时直接遍历
+        self._connectors: Tuple[BinanceConnector, ...] = ()
+        self._connectors_ready = False  # initialize_connectors全部步骤（含连接检查和WebSocket）成功后置位
+        self._executors: Tuple[GridExecutor, ...] = ()
         
         # 事件队列（用于事件驱动模式）
-        self._event_queue = asyncio.Queue()
+        self._event_queue = asyncio.Queue(maxsize=EVENT_QUEUE_MAXSIZE)
+        self._gap_sync_task: Optional[asyncio.Task] = None
 
         # 监控任务
         self.monitor_task: Optional[asyncio.Task] = None
         self.executor_tasks: Dict[str, asyncio.Task] = {}
         self.event_handler_task: Optional[asyncio.Task] = None
 
+        # 配置在初始化时解析一次（配置只读，运行期间不会变化）
+        self._trading_cfg = ALL_CONFIG["trading"]
+        self._grid_cfg = ALL_CONFIG["grid"]
+        self._monitor_cfg = ALL_CONFIG["monitor"]
+        self._exchange_cfg = ALL_CONFIG["exchange"]
+        self._event_driven_enabled = self._grid_cfg.get("event_driven_enabled", False)
+        self._sync_interval = self._monitor_cfg["sync_interval"]
+        self._heartbeat_interval = self._monitor_cfg["heartbeat_interval"]
+
         # 边界监控配置
-        self.boundary_stop_enabled = ALL_CONFIG["grid"].get("boundary_stop_enabled", True)
-        self.boundary_check_interval = ALL_CONFIG["grid"].get("boundary_check_interval", 5)
-        self.last_boundary_check = 0
-        self.stop_signal = False
+        self.boundary_stop_enabled = self._grid_cfg.get("boundary_stop_enabled", True)
+        self.boundary_check_interval = self._grid_cfg.get("boundary_check_interval", 5)
+
+        # 停止令牌：置位后各后台循环立即退出，而不是轮询布尔标志
+        self.cancel_event = asyncio.Event()
+        self._stop_task: Optional[asyncio.Task] = None  # 监控检查发起的停止任务
+
+        # 策略状态缓存
+        self._status_cache: Optional[Dict[str, Any]] = None
+        self._status_cache_time = float('-inf')
 
         self.logger.info("StrategyController initialized")
     
@@ -64,53 +169,66 @@ class StrategyController:
             # 获取配置
             account_a_config = get_account_config("A")
             account_b_config = get_account_config("B")
-            trading_config = ALL_CONFIG["trading"]
-            exchange_config = ALL_CONFIG["exchange"]
+            trading_config = self._trading_cfg
+            exchange_config = self._exchange_cfg
             
             # 根据配置决定是否传递事件队列
-            event_queue = self._event_queue if ALL_CONFIG["grid"].get("event_driven_enabled", False) else None
-
-            # 初始化账户A连接器（多头）
-            self.connector_a = BinanceConnector(
-                api_key=account_a_config["api_key"],
-                api_secret=account_a_config["api_secret"],
-                trading_pair=trading_config["pair"],
-                contract_type=trading_config["contract_type"],
-                leverage=trading_config["leverage"],
-                sandbox=exchange_config["sandbox"],
-                account_name=account_a_config["name"],
-                event_queue=event_queue
-            )
+            event_queue = self._event_queue if self._event_driven_enabled else None
+
+            def make_connector(account_config) -> BinanceConnector:
+                return BinanceConnector(
+                    api_key=account_config["api_key"],
+                    api_secret=account_config["api_secret"],
+                    trading_pair=trading_config["pair"],
+                    contract_type=trading_config["contract_type"],
+                    leverage=trading_config["leverage"],
+                    sandbox=exchange_config["sandbox"],
+                    account_name=account_config["name"],
+                    event_queue=event_queue
+                )
 
-            # 初始化账户B连接器（空头）
-            self.connector_b = BinanceConnector(
-                api_key=account_b_config["api_key"],
-                api_secret=account_b_config["api_secret"],
-                trading_pair=trading_config["pair"],
-                contract_type=trading_config["contract_type"],
-                leverage=trading_config["leverage"],
-                sandbox=exchange_config["sandbox"],
-                account_name=account_b_config["name"],
-                event_queue=event_queue
+            # 构造连接器会同步加载市场数据，两个账户（A多头、B空头）放到线程中并发构造
+            self.connector_a, self.connector_b = await asyncio.gather(
+                asyncio.to_thread(make_connector, account_a_config),
+                asyncio.to_thread(make_connector, account_b_config)
             )
+            self._connectors = (self.connector_a, self.connector_b)
             
-            # 验证连接
-            if not self.connector_a.is_connected():
+            # 验证连接（WebSocket尚未启动，使用REST检查）
+            ping_a, ping_b = await asyncio.gather(
+                self.connector_a.ping_rest_async(), self.connector_b.ping_rest_async()
+            )
+            if not ping_a:
                 raise Exception("Failed to connect to Account A")
             
-            if not self.connector_b.is_connected():
+            if not ping_b:
                 raise Exception("Failed to connect to Account B")
             
             self.logger.info("Binance connectors initialized successfully")
 
             # 启动WebSocket连接以提高性能
             self.logger.info("Starting WebSocket connections...")
-            await self.connector_a.start_websocket()
-            await self.connector_b.start_websocket()
+            ws_results = await asyncio.gather(
+                self.connector_a.start_websocket(), self.connector_b.start_websocket(),
+                return_exceptions=True
+            )
+            if isinstance(ws_results[0], Exception):
+                self.logger.error(f"Account A WebSocket start failed: {ws_results[0]}")
+                raise ws_results[0]
+            if isinstance(ws_results[1], Exception):
+                self.logger.error(f"Account B WebSocket start failed: {ws_results[1]}")
+                raise ws_results[1]
             self.logger.info("WebSocket connections started")
+            self._connectors_ready = True
 
         except Exception as e:
             self.logger.error(f"Failed to initialize connectors: {e}")
+            # 未通过检查的连接器不能留给start()继续使用，关闭后清空，下次重新初始化
+            if self._connectors:
+                await asyncio.gather(*(connector.close() for connector in self._connectors),
+                                     return_exceptions=True)
+            self.connector_a = self.connector_b = None
+            self._connectors = ()
             raise
     
     async def cleanup_accounts(self):
@@ -118,11 +236,10 @@ class StrategyController:
         try:
             self.logger.info("Starting account cleanup...")
             
-            # 并行清理两个账户（注意：cleanup是同步方法）
-            loop = asyncio.get_event_loop()
+            # 并行清理两个账户
             results = await asyncio.gather(
-                loop.run_in_executor(None, self.connector_a.cleanup),
-                loop.run_in_executor(None, self.connector_b.cleanup),
+                self.connector_a.cleanup(),
+                self.connector_b.cleanup(),
                 return_exceptions=True
             )
             
@@ -151,8 +268,9 @@ class StrategyController:
             self.logger.info("Starting fund balancing...")
             
             # 获取两个账户的余额
-            balance_a = self.connector_a.get_balance()
-            balance_b = self.connector_b.get_balance()
+            balance_a, balance_b = await asyncio.gather(
+                self.connector_a.get_balance_async(), self.connector_b.get_balance_async()
+            )
             
             free_a = balance_a["free"]
             free_b = balance_b["free"]
@@ -160,16 +278,12 @@ class StrategyController:
             self.logger.info(f"Account A balance: {free_a}")
             self.logger.info(f"Account B balance: {free_b}")
             
-            # 计算平均余额
-            total_balance = free_a + free_b
-            target_balance = total_balance / 2
-            
-            # 计算需要转移的金额
-            diff = abs(free_a - free_b)
-            transfer_amount = diff / 2
+            # 计算需要转移的金额（整数最小单位）
+            transfer_micro = abs(_to_micro(free_a) - _to_micro(free_b)) // 2
+            transfer_amount = _from_micro(transfer_micro)
             
             # 如果差异很小，不需要转移
-            if transfer_amount < Decimal("1"):  # 小于1 USDC的差异忽略
+            if transfer_micro < MIN_TRANSFER_MICRO:
                 self.logger.info("Fund balances are already balanced")
                 return
             
@@ -196,65 +310,33 @@ class StrategyController:
         try:
             self.logger.info("Initializing grid executors...")
             
-            # 获取配置
-            grid_config = ALL_CONFIG["grid"]
-            trading_config = ALL_CONFIG["trading"]
-            monitor_config = ALL_CONFIG["monitor"]
-            
-            # 创建多头网格执行器配置
-            long_config = GridExecutorConfig(
-                id="long_grid",
-                timestamp=time.time(),
-                trading_pair=trading_config["pair"],
-                side=TradeType.BUY,
-                start_price=grid_config["start_price"],
-                end_price=grid_config["end_price"],
-                total_amount_quote=grid_config["total_amount_quote"],
-                max_open_orders=grid_config["max_open_orders"],
-                min_spread_between_orders=grid_config["min_spread_between_orders"],
-                min_order_amount_quote=grid_config["min_order_amount_quote"],
-                order_type=OrderType.LIMIT,
-                order_frequency=grid_config["order_frequency"],
-                activation_bounds=grid_config["activation_bounds"],
-                safe_extra_spread=grid_config["safe_extra_spread"],
-                take_profit_pct=grid_config["take_profit_pct"],
-                leverage=trading_config["leverage"]
-            )
-            
-            # 创建空头网格执行器配置
-            short_config = GridExecutorConfig(
-                id="short_grid",
-                timestamp=time.time(),
-                trading_pair=trading_config["pair"],
-                side=TradeType.SELL,
-                start_price=grid_config["start_price"],
-                end_price=grid_config["end_price"],
-                total_amount_quote=grid_config["total_amount_quote"],
-                max_open_orders=grid_config["max_open_orders"],
-                min_spread_between_orders=grid_config["min_spread_between_orders"],
-                min_order_amount_quote=grid_config["min_order_amount_quote"],
-                order_type=OrderType.LIMIT,
-                order_frequency=grid_config["order_frequency"],
-                activation_bounds=grid_config["activation_bounds"],
-                safe_extra_spread=grid_config["safe_extra_spread"],
-                take_profit_pct=grid_config["take_profit_pct"],
-                leverage=trading_config["leverage"]
-            )
+            monitor_config = self._monitor_cfg
+
+            # 从导入时构建的模板复制执行器配置，只填入时间戳（多空共用同一时间戳）
+            timestamp = time.time()
+            long_config = _LONG_GRID_CONFIG.model_copy(update={"timestamp": timestamp})
+            short_config = _SHORT_GRID_CONFIG.model_copy(update={"timestamp": timestamp})
             
+            # 两个执行器交易同一交易对，只查询一次中间价用于生成网格
+            mid_price = self.connector_a.get_mid_price()
+
             # 创建执行器实例
             self.executor_long = GridExecutor(
                 config=long_config,
                 connector=self.connector_a,
                 update_interval=monitor_config["update_interval"],
-                max_retries=monitor_config["max_retries"]
+                max_retries=monitor_config["max_retries"],
+                mid_price=mid_price
             )
             
             self.executor_short = GridExecutor(
                 config=short_config,
                 connector=self.connector_b,
                 update_interval=monitor_config["update_interval"],
-                max_retries=monitor_config["max_retries"]
+                max_retries=monitor_config["max_retries"],
+                mid_price=mid_price
             )
+            self._executors = (self.executor_long, self.executor_short)
             
             self.logger.info("Grid executors initialized successfully")
             
@@ -267,9 +349,11 @@ class StrategyController:
         try:
             self.logger.info("Starting dual account hedge grid strategy...")
             self.start_time = datetime.now()
+            self._start_monotonic = time.monotonic()
 
-            # 1. 初始化连接器
-            await self.initialize_connectors()
+            # 1. 初始化连接器（启动前清理时可能已初始化）
+            if not self._connectors_ready:
+                await self.initialize_connectors()
 
             # 2. 清理账户
             await self.cleanup_accounts()
@@ -287,7 +371,7 @@ class StrategyController:
             await self.start_executors()
 
             # 7. 启动事件监听（如果启用）
-            if ALL_CONFIG["grid"].get("event_driven_enabled", False):
+            if self._event_driven_enabled:
                 await self.start_event_listening()
             else:
                 self.logger.info("事件驱动模式已禁用，使用轮询模式")
@@ -309,28 +393,32 @@ class StrategyController:
             self.logger.info("Validating dual account balance with leverage...")
 
             # 获取两个账户的余额
-            balance_a = self.connector_a.get_balance()
-            balance_b = self.connector_b.get_balance()
+            balance_a, balance_b = await asyncio.gather(
+                self.connector_a.get_balance_async(), self.connector_b.get_balance_async()
+            )
 
             available_a = balance_a["free"]
             available_b = balance_b["free"]
 
             # 获取配置
-            trading_config = ALL_CONFIG["trading"]
-            grid_config = ALL_CONFIG["grid"]
+            trading_config = self._trading_cfg
+            grid_config = self._grid_cfg
 
             # 获取杠杆倍数
             leverage = trading_config["leverage"]
 
-            # 计算名义价值（余额 × 杠杆）
-            nominal_value_a = available_a * leverage
-            nominal_value_b = available_b * leverage
-
             # 获取配置要求的资金
             required_amount = grid_config["total_amount_quote"]
 
-            # 取两个账户中较小的名义价值
-            min_nominal_value = min(nominal_value_a, nominal_value_b)
+            # 计算名义价值（余额 × 杠杆）并与要求比较，按整数最小单位计算
+            nominal_micro_a, nominal_micro_b, min_nominal_micro, sufficient = _check_nominal(
+                _to_micro(available_a), _to_micro(available_b), leverage, _to_micro(required_amount)
+            )
+
+            # 日志输出用的Decimal值
+            nominal_value_a = _from_micro(nominal_micro_a)
+            nominal_value_b = _from_micro(nominal_micro_b)
+            min_nominal_value = _from_micro(min_nominal_micro)
 
             self.logger.info(f"Account A: balance={available_a}, leverage={leverage}, nominal_value={nominal_value_a}")
             self.logger.info(f"Account B: balance={available_b}, leverage={leverage}, nominal_value={nominal_value_b}")
@@ -338,7 +426,7 @@ class StrategyController:
             self.logger.info(f"Minimum nominal value: {min_nominal_value}")
 
             # 验证最小名义价值是否满足要求
-            if min_nominal_value < required_amount:
+            if not sufficient:
                 error_msg = f"名义价值不足: 最小名义价值 {min_nominal_value} < 要求 {required_amount}"
                 self.logger.error(error_msg)
                 self.logger.error(f"账户A名义价值: {nominal_value_a} (余额: {available_a} × 杠杆: {leverage})")
@@ -384,16 +472,25 @@ class StrategyController:
             raise
 
     async def _run_executor_loop(self, executor: GridExecutor):
-        """运行执行器的控制循环"""
-        try:
-            while executor.is_active and self.is_running:
+        """
+        运行执行器的控制循环（连续出错超过执行器的最大重试次数时停止整个策略）；
+        这是执行器唯一的控制循环，订单事件的唤醒只由这里消费
+        """
+        consecutive_errors = 0
+        while executor.is_active and self.is_running:
+            try:
                 await executor.control_task()
-                await asyncio.sleep(executor.update_interval)
+                consecutive_errors = 0
+            except Exception as e:
+                consecutive_errors += 1
+                self.logger.error(f"Executor loop error for {executor.config.id} "
+                                  f"({consecutive_errors}/{executor.max_retries}): {e}")
+                if consecutive_errors >= executor.max_retries:
+                    # stop()会取消执行器任务，放到独立任务中执行
+                    self._request_stop()
+                    return
 
-        except Exception as e:
-            self.logger.error(f"Executor loop error for {executor.config.id}: {e}")
-            # 如果一个执行器出错，停止整个策略
-            await self.stop()
+            await executor.wait_for_update()
 
     async def start_event_listening(self):
         """启动事件监听"""
@@ -416,28 +513,46 @@ class StrategyController:
     async def _event_handler_loop(self):
         """事件处理循环"""
         try:
-            while self.is_running:
+            while self.is_running and not self.cancel_event.is_set():
                 try:
-                    # 等待事件，设置超时避免阻塞
-                    event = await asyncio.wait_for(self._event_queue.get(), timeout=1.0)
+                    # 阻塞等待事件；停止时由stop()取消本任务
+                    event = await self._event_queue.get()
+
+                    # 事件丢失：通过REST轮询补齐订单状态
+                    if event.event_type == "GAP":
+                        self._schedule_gap_sync(event)
+                        continue
 
                     # 根据账户名分发事件
-                    if event["account_name"] == self.connector_a.account_name:
-                        self.executor_long.process_event(event["data"])
-                    elif event["account_name"] == self.connector_b.account_name:
-                        self.executor_short.process_event(event["data"])
+                    if event.account_name == self.connector_a.account_name:
+                        self.executor_long.process_event(event.data)
+                    elif event.account_name == self.connector_b.account_name:
+                        self.executor_short.process_event(event.data)
                     else:
-                        self.logger.warning(f"收到未知账户的事件: {event['account_name']}")
+                        self.logger.warning(f"收到未知账户的事件: {event.account_name}")
 
-                except asyncio.TimeoutError:
-                    # 超时是正常的，继续循环
-                    continue
                 except Exception as e:
                     self.logger.error(f"处理事件失败: {e}")
 
         except Exception as e:
             self.logger.error(f"事件处理循环异常: {e}")
 
+    def _schedule_gap_sync(self, event: OrderEvent):
+        """事件队列溢出后触发一次订单状态对账（对账进行中时不重复触发）"""
+        self.logger.warning(f"检测到事件丢失: {event.account_name} seq={event.seq}，启动订单对账")
+
+        if self._gap_sync_task and not self._gap_sync_task.done():
+            return
+
+        self._gap_sync_task = asyncio.create_task(self._sync_after_gap())
+
+    async def _sync_after_gap(self):
+        """丢失事件后通过REST同步两个执行器的订单状态"""
+        await asyncio.gather(
+            self.executor_long.sync_orders_status_fallback(),
+            self.executor_short.sync_orders_status_fallback()
+        )
+
     async def start_monitoring(self):
         """启动监控任务"""
         try:
@@ -453,59 +568,64 @@ class StrategyController:
             raise
 
     async def _monitor_loop(self):
-        """监控循环"""
+        """监控循环：各项检查按各自周期独立运行，停止令牌置位后全部退出"""
         try:
-            monitor_config = ALL_CONFIG["monitor"]
-            sync_interval = monitor_config["sync_interval"]
-            heartbeat_interval = monitor_config["heartbeat_interval"]
-
-            last_sync_time = 0
-            last_heartbeat_time = 0
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self._run_periodic(self._sync_status, self._sync_interval))
+                tg.create_task(self._run_periodic(self._heartbeat_check, self._heartbeat_interval))
+                tg.create_task(self._watch_executor_tasks())
+                if self.boundary_stop_enabled:
+                    tg.create_task(self._run_periodic(self._boundary_check, self.boundary_check_interval))
 
-            while self.is_running and not self.stop_signal:
-                current_time = time.time()
-
-                # 定期同步状态
-                if current_time - last_sync_time >= sync_interval:
-                    await self._sync_status()
-                    last_sync_time = current_time
-
-                # 定期心跳检查
-                if current_time - last_heartbeat_time >= heartbeat_interval:
-                    await self._heartbeat_check()
-                    last_heartbeat_time = current_time
-
-                # 边界检查（定时执行）
-                if (self.boundary_stop_enabled and
-                    current_time - self.last_boundary_check >= self.boundary_check_interval):
-
-                    if await self._check_price_boundary():
-                        self.logger.critical("🚨 检测到价格触碰边界，启动紧急停止程序")
-                        await self._handle_boundary_breach()
-                        break
-
-                    self.last_boundary_check = current_time
+        except Exception as e:
+            self.logger.error(f"Monitor loop error: {e}")
+            self._request_stop()
+
+    async def _run_periodic(self, check, interval: float):
+        """按固定周期执行检查，两次检查之间挂起等待停止令牌，到期由事件循环定时器唤醒"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while not self.cancel_event.is_set():
+            await check()
+            # 按固定节拍计算下次执行时间；检查本身超时时不补跑
+            deadline = max(deadline + interval, loop.time())
+            try:
+                async with asyncio.timeout_at(deadline):
+                    await self.cancel_event.wait()
+            except asyncio.TimeoutError:
+                pass
+
+    async def _watch_executor_tasks(self):
+        """等待任一执行器任务结束或停止令牌置位，无需周期轮询"""
+        stop_waiter = asyncio.create_task(self.cancel_event.wait())
+        try:
+            await asyncio.wait({stop_waiter, *self.executor_tasks.values()}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stop_waiter.cancel()
 
-                # 检查执行器状态
-                await self._check_executor_health()
+        if not self.cancel_event.is_set():
+            await self._check_executor_health()
 
-                await asyncio.sleep(1)  # 每秒检查一次
+    async def _boundary_check(self):
+        """边界检查，触碰边界时紧急停止（处理程序会置位停止令牌）"""
+        if await self._check_price_boundary():
+            self.logger.critical("🚨 检测到价格触碰边界，启动紧急停止程序")
+            await self._handle_boundary_breach()
 
-        except Exception as e:
-            self.logger.error(f"Monitor loop error: {e}")
-            await self.stop()
+    def _request_stop(self):
+        """在独立任务中停止策略，避免监控任务在stop()中取消自身"""
+        if self._stop_task is None:
+            self._stop_task = asyncio.create_task(self.stop())
 
     async def _sync_status(self):
         """同步状态"""
         try:
-            # 更新连接器状态
-            if self.connector_a:
-                self.connector_a.update_order_status()
-                self.connector_a.get_positions()
-
-            if self.connector_b:
-                self.connector_b.update_order_status()
-                self.connector_b.get_positions()
+            # 更新连接器状态（两个账户的订单和持仓查询并发执行）
+            await asyncio.gather(*(
+                request
+                for connector in self._connectors
+                for request in (connector.update_order_status_async(), connector.get_positions_async())
+            ))
 
             # 记录状态信息
             self._log_status()
@@ -516,27 +636,18 @@ class StrategyController:
     async def _heartbeat_check(self):
         """心跳检查"""
         try:
-            # 检查连接器连接状态
-            if self.connector_a and not self.connector_a.is_connected():
-                self.logger.error("Account A connection lost")
-                await self.stop()
-                return
-
-            if self.connector_b and not self.connector_b.is_connected():
-                self.logger.error("Account B connection lost")
-                await self.stop()
-                return
-
-            # 检查执行器健康状态
-            if self.executor_long and not self.executor_long.is_healthy():
-                self.logger.error("Long executor is unhealthy")
-                await self.stop()
-                return
+            # 连接状态和执行器健康状态都是缓存标志的读取，逐个检查即可，遇到第一个异常就停止
+            for connector in self._connectors:
+                if not connector.is_connected():
+                    self.logger.error(f"{connector.account_name} connection lost")
+                    self._request_stop()
+                    return
 
-            if self.executor_short and not self.executor_short.is_healthy():
-                self.logger.error("Short executor is unhealthy")
-                await self.stop()
-                return
+            for executor in self._executors:
+                if not executor.is_healthy():
+                    self.logger.error(f"{executor.config.id} executor is unhealthy")
+                    self._request_stop()
+                    return
 
         except Exception as e:
             self.logger.error(f"Heartbeat check error: {e}")
@@ -547,19 +658,19 @@ class StrategyController:
             # 检查执行器是否因止损等原因停止
             if self.executor_long and self.executor_long.status == RunnableStatus.SHUTTING_DOWN:
                 self.logger.warning("Long executor is shutting down, stopping strategy")
-                await self.stop()
+                self._request_stop()
                 return
 
             if self.executor_short and self.executor_short.status == RunnableStatus.SHUTTING_DOWN:
                 self.logger.warning("Short executor is shutting down, stopping strategy")
-                await self.stop()
+                self._request_stop()
                 return
 
             # 检查执行器任务是否完成
             for name, task in self.executor_tasks.items():
                 if task.done():
                     self.logger.warning(f"Executor task {name} completed unexpectedly")
-                    await self.stop()
+                    self._request_stop()
                     return
 
         except Exception as e:
@@ -569,30 +680,29 @@ class StrategyController:
         """记录状态信息"""
         try:
             if self.executor_long and self.executor_short:
-                long_status = self.executor_long.get_status_info()
-                short_status = self.executor_short.get_status_info()
-
                 # 获取连接状态
                 conn_a_status = self.connector_a.is_connected() if self.connector_a else False
                 conn_b_status = self.connector_b.is_connected() if self.connector_b else False
 
-                # 获取详细连接信息
-                conn_a_details = self.connector_a.get_connection_status() if self.connector_a else {}
-                conn_b_details = self.connector_b.get_connection_status() if self.connector_b else {}
-
-                self.logger.info(
-                    f"Strategy Status - "
-                    f"Long: {long_status['status']} (Position: {long_status['position_size_base']:.2f}), "
-                    f"Short: {short_status['status']} (Position: {short_status['position_size_base']:.2f}), "
-                    f"Grid Levels: {long_status['grid_levels']}, "
-                    f"Connections: A={conn_a_status}, B={conn_b_status}"
-                )
+                # INFO被过滤时跳过状态信息的读取和格式化
+                if self.logger.isEnabledFor(logging.INFO):
+                    long_status = self.executor_long.get_status_info()
+                    short_status = self.executor_short.get_status_info()
+                    self.logger.info(
+                        "Strategy Status - Long: %s (Position: %.2f), Short: %s (Position: %.2f), "
+                        "Grid Levels: %s, Connections: A=%s, B=%s",
+                        long_status['status'], long_status['position_size_base'],
+                        short_status['status'], short_status['position_size_base'],
+                        long_status['grid_levels'], conn_a_status, conn_b_status
+                    )
 
                 # 如果连接不健康，记录详细信息
                 if not conn_a_status:
-                    self.logger.warning(f"Account A WebSocket连接异常: {conn_a_details}")
+                    conn_a_details = self.connector_a.get_connection_status() if self.connector_a else {}
+                    self.logger.warning("Account A WebSocket连接异常: %s", conn_a_details)
                 if not conn_b_status:
-                    self.logger.warning(f"Account B WebSocket连接异常: {conn_b_details}")
+                    conn_b_details = self.connector_b.get_connection_status() if self.connector_b else {}
+                    self.logger.warning("Account B WebSocket连接异常: %s", conn_b_details)
 
         except Exception as e:
             self.logger.error(f"Status logging error: {e}")
@@ -602,32 +712,27 @@ class StrategyController:
         try:
             self.logger.info("Stopping dual account hedge grid strategy...")
             self.is_running = False
+            self.cancel_event.set()
             self.stop_time = datetime.now()
 
             # 1. 停止事件监听任务
             if self.event_handler_task and not self.event_handler_task.done():
                 self.event_handler_task.cancel()
-                try:
+                with contextlib.suppress(asyncio.CancelledError):
                     await self.event_handler_task
-                except asyncio.CancelledError:
-                    pass
 
             # 2. 停止监控任务
             if self.monitor_task and not self.monitor_task.done():
                 self.monitor_task.cancel()
-                try:
+                with contextlib.suppress(asyncio.CancelledError):
                     await self.monitor_task
-                except asyncio.CancelledError:
-                    pass
 
             # 3. 停止执行器任务
             for name, task in self.executor_tasks.items():
                 if not task.done():
                     task.cancel()
-                    try:
+                    with contextlib.suppress(asyncio.CancelledError):
                         await task
-                    except asyncio.CancelledError:
-                        pass
 
             # 3. 停止连接器事件监听
             if self.connector_a:
@@ -659,22 +764,13 @@ class StrategyController:
         try:
             self.logger.info("Stopping grid executors...")
 
-            stop_tasks = []
-
-            if self.executor_long:
-                stop_tasks.append(self.executor_long.stop())
+            results = await asyncio.gather(*(executor.stop() for executor in self._executors),
+                                           return_exceptions=True)
 
-            if self.executor_short:
-                stop_tasks.append(self.executor_short.stop())
-
-            if stop_tasks:
-                results = await asyncio.gather(*stop_tasks, return_exceptions=True)
-
-                # 检查停止结果
-                for i, result in enumerate(results):
-                    if isinstance(result, Exception):
-                        executor_name = "long" if i == 0 else "short"
-                        self.logger.error(f"{executor_name} executor stop failed: {result}")
+            # 检查停止结果
+            for executor, result in zip(self._executors, results):
+                if isinstance(result, Exception):
+                    self.logger.error(f"{executor.config.id} executor stop failed: {result}")
 
             self.logger.info("Grid executors stopped")
 
@@ -686,24 +782,13 @@ class StrategyController:
         try:
             self.logger.info("Performing final cleanup...")
 
-            cleanup_tasks = []
-
-            if self.connector_a:
-                loop = asyncio.get_event_loop()
-                cleanup_tasks.append(loop.run_in_executor(None, self.connector_a.cleanup))
-
-            if self.connector_b:
-                loop = asyncio.get_event_loop()
-                cleanup_tasks.append(loop.run_in_executor(None, self.connector_b.cleanup))
-
-            if cleanup_tasks:
-                results = await asyncio.gather(*cleanup_tasks, return_exceptions=True)
+            results = await asyncio.gather(*(connector.cleanup() for connector in self._connectors),
+                                           return_exceptions=True)
 
-                # 检查清理结果
-                for i, result in enumerate(results):
-                    if isinstance(result, Exception):
-                        account_name = "A" if i == 0 else "B"
-                        self.logger.error(f"Account {account_name} final cleanup failed: {result}")
+            # 检查清理结果
+            for connector, result in zip(self._connectors, results):
+                if isinstance(result, Exception):
+                    self.logger.error(f"{connector.account_name} final cleanup failed: {result}")
 
             self.logger.info("Final cleanup completed")
 
@@ -715,25 +800,15 @@ class StrategyController:
         try:
             self.logger.info("Verifying final cleanup...")
 
-            verification_tasks = []
-
-            if self.connector_a:
-                loop = asyncio.get_event_loop()
-                verification_tasks.append(loop.run_in_executor(None, self.connector_a.verify_cleanup))
-
-            if self.connector_b:
-                loop = asyncio.get_event_loop()
-                verification_tasks.append(loop.run_in_executor(None, self.connector_b.verify_cleanup))
-
-            if verification_tasks:
-                results = await asyncio.gather(*verification_tasks, return_exceptions=True)
+            if self._connectors:
+                results = await asyncio.gather(*(connector.verify_cleanup_async() for connector in self._connectors),
+                                               return_exceptions=True)
 
                 # 检查验证结果
                 all_verified = True
-                for i, result in enumerate(results):
+                for connector, result in zip(self._connectors, results):
                     if isinstance(result, Exception) or not result:
-                        account_name = "A" if i == 0 else "B"
-                        self.logger.error(f"Account {account_name} cleanup verification failed")
+                        self.logger.error(f"{connector.account_name} cleanup verification failed")
                         all_verified = False
 
                 if all_verified:
@@ -749,20 +824,15 @@ class StrategyController:
         try:
             self.logger.info("Performing emergency cleanup...")
 
-            # 强制取消所有订单和平掉所有持仓
-            if self.connector_a:
+            async def force_cleanup(connector: BinanceConnector):
                 try:
-                    self.connector_a.cancel_all_orders()
-                    self.connector_a.close_all_positions()
+                    await connector.cancel_all_orders_async()
+                    await connector.close_all_positions_async()
                 except Exception as e:
-                    self.logger.error(f"Emergency cleanup Account A failed: {e}")
+                    self.logger.error(f"Emergency cleanup {connector.account_name} failed: {e}")
 
-            if self.connector_b:
-                try:
-                    self.connector_b.cancel_all_orders()
-                    self.connector_b.close_all_positions()
-                except Exception as e:
-                    self.logger.error(f"Emergency cleanup Account B failed: {e}")
+            # 强制取消所有订单和平掉所有持仓（两个账户各自的REST线程池并行执行）
+            await asyncio.gather(*(force_cleanup(connector) for connector in self._connectors))
 
             self.logger.info("Emergency cleanup completed")
 
@@ -770,20 +840,24 @@ class StrategyController:
             self.logger.error(f"Emergency cleanup failed: {e}")
 
     def get_strategy_status(self) -> Dict[str, Any]:
-        """获取策略状态信息"""
+        """获取策略状态信息（STRATEGY_STATUS_CACHE_TTL秒内重复调用返回缓存）"""
+        now = time.monotonic()
+        if self._status_cache is not None and now - self._status_cache_time < STRATEGY_STATUS_CACHE_TTL:
+            return self._status_cache
+
         try:
             status = {
                 "is_running": self.is_running,
                 "start_time": self.start_time.isoformat() if self.start_time else None,
                 "stop_time": self.stop_time.isoformat() if self.stop_time else None,
-                "uptime": str(datetime.now() - self.start_time) if self.start_time else None,
+                "uptime": _format_uptime(now - self._start_monotonic) if self._start_monotonic is not None else None,
                 "connectors": {
                     "account_a": self.connector_a.get_account_info() if self.connector_a else None,
                     "account_b": self.connector_b.get_account_info() if self.connector_b else None,
                 },
                 "executors": {
-                    "long": self.executor_long.get_status_info() if self.executor_long else None,
-                    "short": self.executor_short.get_status_info() if self.executor_short else None,
+                    "long": _snapshot_status_info(self.executor_long.get_status_info()) if self.executor_long else None,
+                    "short": _snapshot_status_info(self.executor_short.get_status_info()) if self.executor_short else None,
                 },
                 "tasks": {
                     "monitor_running": self.monitor_task and not self.monitor_task.done() if self.monitor_task else False,
@@ -793,6 +867,8 @@ class StrategyController:
                 }
             }
 
+            self._status_cache = status
+            self._status_cache_time = now
             return status
 
         except Exception as e:
@@ -802,23 +878,10 @@ class StrategyController:
     def is_healthy(self) -> bool:
         """检查策略是否健康"""
         try:
+            # 按开销从低到高检查，任一项失败立即返回
             if not self.is_running:
                 return False
 
-            # 检查连接器
-            if not (self.connector_a and self.connector_a.is_connected()):
-                return False
-
-            if not (self.connector_b and self.connector_b.is_connected()):
-                return False
-
-            # 检查执行器
-            if not (self.executor_long and self.executor_long.is_healthy()):
-                return False
-
-            if not (self.executor_short and self.executor_short.is_healthy()):
-                return False
-
             # 检查任务
             if self.monitor_task and self.monitor_task.done():
                 return False
@@ -827,6 +890,13 @@ class StrategyController:
                 if task.done():
                     return False
 
+            # 检查执行器和连接器（未全部创建时元组为空）
+            if not (self._executors and all(executor.is_healthy() for executor in self._executors)):
+                return False
+
+            if not (self._connectors and all(connector.is_connected() for connector in self._connectors)):
+                return False
+
             return True
 
         except Exception as e:
@@ -838,23 +908,21 @@ class StrategyController:
         try:
             self.logger.info("Starting cleanup...")
 
-            # 停止网格执行器
-            if hasattr(self, 'executor_a') and self.executor_a:
-                await self.executor_a.stop()
-
-            if hasattr(self, 'executor_b') and self.executor_b:
-                await self.executor_b.stop()
-
-            # 清理账户：撤销挂单并平仓
-            self.logger.info("Cleaning up accounts...")
-            await self.cleanup_accounts()
+            # 停止尚未终止的网格执行器（两个执行器并行）
+            executors = [executor for executor in self._executors if executor.status != RunnableStatus.TERMINATED]
+            results = await asyncio.gather(*(executor.stop() for executor in executors), return_exceptions=True)
+            for executor, result in zip(executors, results):
+                if isinstance(result, Exception):
+                    self.logger.error(f"Executor {executor.config.id} stop failed: {result}")
 
-            # 停止WebSocket连接
-            if hasattr(self, 'connector_a') and self.connector_a:
-                await self.connector_a.stop_websocket()
-
-            if hasattr(self, 'connector_b') and self.connector_b:
-                await self.connector_b.stop_websocket()
+            try:
+                # 清理账户：撤销挂单并平仓
+                if self._connectors:
+                    self.logger.info("Cleaning up accounts...")
+                    await self.cleanup_accounts()
+            finally:
+                # 停止WebSocket连接并释放REST线程池（两个连接器并行），清理失败也要关闭
+                await asyncio.gather(*(connector.close() for connector in self._connectors), return_exceptions=True)
 
             self.logger.info("Cleanup completed")
 
@@ -866,10 +934,9 @@ class StrategyController:
         try:
             # 获取当前价格
             current_price = self.connector_a.get_mid_price()
-            grid_config = ALL_CONFIG["grid"]
 
-            upper_boundary = grid_config["end_price"]
-            lower_boundary = grid_config["start_price"]
+            upper_boundary = GRID_PARAMS.end_price
+            lower_boundary = GRID_PARAMS.start_price
 
             # 检查边界触碰
             if current_price >= upper_boundary:
@@ -894,7 +961,7 @@ class StrategyController:
 
             # 1. 立即停止策略运行
             self.is_running = False
-            self.stop_signal = True
+            self.cancel_event.set()
             self.stop_time = datetime.now()
 
             # 2. 执行紧急清理
@@ -912,7 +979,7 @@ class StrategyController:
             self.logger.critical(f"边界突破处理失败: {e}")
             # 确保策略停止
             self.is_running = False
-            self.stop_signal = True
+            self.cancel_event.set()
 
     async def _emergency_cleanup_all_accounts(self) -> bool:
         """紧急清理所有账户"""
@@ -964,7 +1031,7 @@ class StrategyController:
             cancel_success = False
             for attempt in range(3):
                 try:
-                    cancel_success = connector.cancel_all_orders()
+                    cancel_success = await connector.cancel_all_orders_async()
                     if cancel_success:
                         self.logger.info(f"{account_name} 挂单取消成功")
                         break
@@ -982,7 +1049,7 @@ class StrategyController:
             close_success = False
             for attempt in range(3):
                 try:
-                    close_success = connector.close_all_positions()
+                    close_success = await connector.close_all_positions_async()
                     if close_success:
                         self.logger.info(f"{account_name} 持仓平仓成功")
                         break
@@ -1018,12 +1085,12 @@ class StrategyController:
     async def _verify_single_account_clean(self, account_name: str, connector: BinanceConnector) -> bool:
         """验证单个账户清理结果"""
         try:
-            # 检查挂单
-            orders = connector.get_open_orders()
+            # 同时检查挂单和持仓
+            orders, (long_pos, short_pos) = await asyncio.gather(
+                connector.get_open_orders_async(), connector.get_positions_async()
+            )
             orders_clean = len(orders) == 0
 
-            # 检查持仓
-            long_pos, short_pos = connector.get_positions()
             positions_clean = abs(long_pos) < 0.001 and abs(short_pos) < 0.001  # 允许微小误差
 
             if orders_clean and positions_clean:
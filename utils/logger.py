@@ -1,13 +1,231 @@
 # dual_grid_bot/utils/logger.py
 
+import atexit
+import contextlib
+import functools
 import logging
 import logging.handlers
 import os
+import queue
+import sys
+import time
 from datetime import datetime
 from typing import Optional
 
 from config import LOG_CONFIG
 
+# 需要在记录日志时查找调用位置（遍历调用栈）的格式字段
+_CALLER_FIELDS = ("%(pathname)", "%(filename)", "%(module)", "%(lineno)", "%(funcName)")
+
+# 性能日志模板，交给logging延迟格式化
+_PERF_TMPL = "Performance: %s took %.3f seconds"
+
+# 后台日志线程：负责格式化和实际写入控制台/文件
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _stop_listener():
+    """停止后台日志线程，并写完队列中剩余的日志"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
+
+def _disable_unused_record_fields(format_string: str):
+    """格式中未用到的日志记录字段不再收集，减少每次记录日志的开销"""
+    if not any(field in format_string for field in _CALLER_FIELDS):
+        logging._srcfile = None  # 跳过findCaller的调用栈遍历
+    if "%(thread" not in format_string:
+        logging.logThreads = False
+    if "%(process" not in format_string:
+        logging.logProcesses = False
+        logging.logMultiprocessing = False
+    if "%(taskName)" not in format_string:
+        logging.logAsyncioTasks = False
+
+
+def _report_flush_error(handler: logging.Handler, exc: BaseException):
+    """处理器写出失败时向原始标准错误输出一行诊断信息（与logging.raiseExceptions一致，关闭时静默）"""
+    if not logging.raiseExceptions or sys.__stderr__ is None:
+        return
+    try:
+        sys.__stderr__.write(f"--- Logging error: {type(handler).__name__} flush failed: {exc!r}\n")
+    except OSError:
+        pass
+
+
+# RawStreamHandler暂存的字节数超过该值时立即写出，持续有日志时也不会无限堆积
+RAW_STREAM_FLUSH_BYTES = 64 * 1024
+
+# 轮转判断时为当前记录预留的字节数，代替对记录再做一次格式化
+ROLLOVER_MARGIN = 1024
+
+
+class CachingFormatter(logging.Formatter):
+    """
+    同一条记录交给多个处理器（控制台+文件）时只格式化一次；
+    是否需要asctime在构造时确定，同一秒内的记录复用已格式化的时间
+    """
+
+    def __init__(self, fmt: Optional[str] = None, datefmt: Optional[str] = None, style: str = '%', **kwargs):
+        super().__init__(fmt, datefmt, style, **kwargs)
+        self._uses_time = self._style.usesTime()
+        self._last_sec = None
+        self._last_str = ''
+
+    def usesTime(self) -> bool:
+        return self._uses_time
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        sec = int(record.created)
+        if sec != self._last_sec:
+            ct = self.converter(record.created)
+            self._last_str = time.strftime(datefmt or self.datefmt or self.default_time_format, ct)
+            self._last_sec = sec
+        if datefmt or self.datefmt or not self.default_msec_format:
+            return self._last_str
+        return self.default_msec_format % (self._last_str, record.msecs)
+
+    def format(self, record: logging.LogRecord) -> str:
+        cached = record.__dict__.get('_cached_msg')
+        if cached is not None and cached[0] is self:
+            return cached[1]
+        msg = super().format(record)
+        record.__dict__['_cached_msg'] = (self, msg)
+        return msg
+
+
+class FastRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    按已写入字节数判断轮转，不再为此格式化记录，也不做特殊文件的stat检查；
+    逐条写入时不flush，由日志线程在队列清空时统一flush，把多条日志合并为一次写入
+    """
+
+    def _open(self):
+        stream = super()._open()
+        self._size = os.fstat(stream.fileno()).st_size
+        return stream
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.maxBytes <= 0:
+            return False
+        if self.stream is None:
+            self.stream = self._open()
+        # 文本流的tell()会先flush缓冲区，这里改用自己累计的字节数
+        return self._size + ROLLOVER_MARGIN >= self.maxBytes
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            msg = self.format(record) + self.terminator
+            self.stream.write(msg)
+            self._size += len(msg.encode(self.encoding or 'utf-8'))
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class RawStreamHandler(logging.Handler):
+    """
+    直接用os.write写标准错误的文件描述符，跳过Python的缓冲IO；
+    记录先编码暂存，flush时一次写出（日志线程在队列清空时调用，暂存过多时emit也会调用）
+    """
+
+    def __init__(self, stream=None):
+        super().__init__()
+        self._fd = (stream or sys.stderr).fileno()
+        self._pending = []
+        self._pending_bytes = 0
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            data = (self.format(record) + "\n").encode('utf-8')
+            self._pending.append(data)
+            self._pending_bytes += len(data)
+            if self._pending_bytes >= RAW_STREAM_FLUSH_BYTES:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        if not self._pending:
+            return
+        data = memoryview(b"".join(self._pending))
+        self._pending.clear()
+        self._pending_bytes = 0
+        try:
+            while data:
+                data = data[os.write(self._fd, data):]
+        except OSError as e:
+            # 管道关闭或暂不可写时丢弃这批输出，不影响日志线程继续运行
+            _report_flush_error(self, e)
+
+    def close(self):
+        self.flush()
+        super().close()
+
+
+def _create_console_handler() -> logging.Handler:
+    """终端下用标准StreamHandler；systemd/Docker等管道输出时直接写文件描述符"""
+    if sys.stderr.isatty():
+        return logging.StreamHandler()
+    return RawStreamHandler()
+
+
+class _InPlaceQueueHandler(logging.handlers.QueueHandler):
+    """直接改写原记录入队，省去标准实现中对每条记录的copy.copy"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 根日志器上只有这一个处理器，记录入队后不会再被其它处理器使用
+        msg = self.format(record)
+        record.message = msg
+        record.msg = msg
+        record.args = None
+        record.exc_info = None
+        record.exc_text = None
+        record.stack_info = None
+        return record
+
+
+class _BatchingQueueListener(logging.handlers.QueueListener):
+    """队列清空、即将阻塞等待时flush各处理器，突发的多条日志只产生一次写入"""
+
+    def dequeue(self, block: bool):
+        if block:
+            try:
+                return self.queue.get(block=False)
+            except queue.Empty:
+                for handler in self.handlers:
+                    # flush出错（磁盘满、管道关闭）不能终止日志线程，否则日志会在队列中无限堆积
+                    try:
+                        handler.flush()
+                    except Exception as e:
+                        _report_flush_error(handler, e)
+        return self.queue.get(block)
+
+
+def _create_file_handler(log_file: str, max_file_size: int, backup_count: int) -> logging.Handler:
+    """创建日志文件处理器（更换文件写入方式时只需修改这里）"""
+    return FastRotatingFileHandler(
+        log_file,
+        maxBytes=max_file_size,
+        backupCount=backup_count,
+        encoding='utf-8',
+        delay=True
+    )
+
 
 def setup_logging(
     level: Optional[str] = None,
@@ -36,45 +254,53 @@ def setup_logging(
     backup_count = backup_count or LOG_CONFIG["backup_count"]
     format_string = format_string or LOG_CONFIG["format"]
     
+    # 日志级别只解析一次，无效的级别名回退到INFO
+    numeric_level = logging.getLevelName(level.upper())
+    if not isinstance(numeric_level, int):
+        numeric_level = logging.INFO
+    
     # 创建日志目录
     log_dir = os.path.dirname(log_file)
-    if log_dir and not os.path.exists(log_dir):
+    if log_dir:
         os.makedirs(log_dir, exist_ok=True)
     
     # 创建格式化器
-    formatter = logging.Formatter(format_string)
+    formatter = CachingFormatter(format_string)
+    _disable_unused_record_fields(format_string)
     
     # 获取根日志器
     root_logger = logging.getLogger()
-    root_logger.setLevel(getattr(logging, level.upper()))
+    root_logger.setLevel(numeric_level)
     
-    # 清除现有的处理器
-    for handler in root_logger.handlers[:]:
-        root_logger.removeHandler(handler)
+    # 清除现有的处理器，重复调用时先停掉旧的后台日志线程
+    root_logger.handlers.clear()
+    _stop_listener()
     
     # 创建控制台处理器
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(getattr(logging, level.upper()))
+    console_handler = _create_console_handler()
+    console_handler.setLevel(numeric_level)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    handlers = [console_handler]
     
     # 创建文件处理器（带轮转）
     if log_file:
-        file_handler = logging.handlers.RotatingFileHandler(
-            log_file,
-            maxBytes=max_file_size,
-            backupCount=backup_count,
-            encoding='utf-8'
-        )
-        file_handler.setLevel(getattr(logging, level.upper()))
+        file_handler = _create_file_handler(log_file, max_file_size, backup_count)
+        file_handler.setLevel(numeric_level)
         file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    # 根日志器只挂QueueHandler，调用方只付入队开销；格式化和写入在后台线程完成
+    global _listener
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(_InPlaceQueueHandler(log_queue))
+    _listener = _BatchingQueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
     
     # 记录启动信息
     root_logger.info("=" * 80)
-    root_logger.info(f"Dual Grid Bot logging initialized at {datetime.now()}")
-    root_logger.info(f"Log level: {level}")
-    root_logger.info(f"Log file: {log_file}")
+    root_logger.info("Dual Grid Bot logging initialized at %s", datetime.now())
+    root_logger.info("Log level: %s", level)
+    root_logger.info("Log file: %s", log_file)
     root_logger.info("=" * 80)
     
     return root_logger
@@ -90,6 +316,12 @@ def get_logger(name: str) -> logging.Logger:
     Returns:
         日志器实例
     """
+    return _cached_logger(name)
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_logger(name: str) -> logging.Logger:
+    """同名日志器只向logging查找一次，之后不再获取logging的模块锁"""
     return logging.getLogger(name)
 
 
@@ -114,7 +346,23 @@ def log_performance(logger: logging.Logger, operation: str, duration: float):
         operation: 操作名称
         duration: 持续时间（秒）
     """
-    logger.info(f"Performance: {operation} took {duration:.3f} seconds")
+    logger.info(_PERF_TMPL, operation, duration)
+
+
+@contextlib.contextmanager
+def perf_timer(logger: logging.Logger, operation: str):
+    """
+    计时代码块并记录性能信息
+    
+    Args:
+        logger: 日志器实例
+        operation: 操作名称
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        log_performance(logger, operation, time.perf_counter() - start)
 
 
 class LoggerMixin:
@@ -122,30 +370,33 @@ class LoggerMixin:
     日志器混入类，为其他类提供日志功能
     """
     
-    @property
-    def logger(self) -> logging.Logger:
-        """获取当前类的日志器"""
-        return get_logger(self.__class__.__name__)
+    # 当前类的日志器，定义子类时解析一次，之后只是普通的类属性读取
+    logger: logging.Logger = get_logger("LoggerMixin")
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.logger = get_logger(cls.__name__)
     
-    def log_info(self, message: str):
+    # 参数按logging的%风格延迟格式化，级别未开启时不会拼接字符串
+    def log_info(self, message: str, *args):
         """记录信息日志"""
-        self.logger.info(message)
+        self.logger.info(message, *args)
     
-    def log_warning(self, message: str):
+    def log_warning(self, message: str, *args):
         """记录警告日志"""
-        self.logger.warning(message)
+        self.logger.warning(message, *args)
     
-    def log_error(self, message: str, exc_info: bool = False):
+    def log_error(self, message: str, *args, exc_info: bool = False):
         """记录错误日志"""
-        self.logger.error(message, exc_info=exc_info)
+        self.logger.error(message, *args, exc_info=exc_info)
     
-    def log_debug(self, message: str):
+    def log_debug(self, message: str, *args):
         """记录调试日志"""
-        self.logger.debug(message)
+        self.logger.debug(message, *args)
     
-    def log_exception(self, message: str):
+    def log_exception(self, message: str, *args):
         """记录异常日志"""
-        log_exception(self.logger, message)
+        self.logger.error(message, *args, exc_info=True)
 
 
 # 预定义的日志器